@@ -0,0 +1,22 @@
+# Asyncio helper utilities for MCP Gateway
+import asyncio
+import contextvars
+import functools
+from typing import Any, Callable
+
+async def to_thread_fast(func: Callable, *args, **kwargs) -> Any:
+    """Run func in the default executor, like asyncio.to_thread.
+
+    asyncio.to_thread always copies the current contextvars context and
+    runs the callable through ctx.run, even when no context variables are
+    set. Skip that wrapper entirely when the copied context is empty —
+    the common case for this gateway — so each off-loop call saves a
+    partial + ctx.run layer.
+    """
+    loop = asyncio.get_running_loop()
+    ctx = contextvars.copy_context()
+    if len(ctx) == 0:
+        return await loop.run_in_executor(None, functools.partial(func, *args, **kwargs))
+    return await loop.run_in_executor(
+        None, functools.partial(ctx.run, func, *args, **kwargs)
+    )
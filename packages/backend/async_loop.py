@@ -0,0 +1,83 @@
+# Synchronous MCP client facade and standalone event-loop thread
+import asyncio
+import concurrent.futures
+import logging
+import threading
+from typing import Any, Coroutine, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+class AsyncLoopThread:
+    """An event loop running on its own daemon thread.
+
+    For processes with no serving loop of their own (sync scripts, batch
+    jobs) that still want to drive async MCP code. A gateway that is
+    already serving must NOT put the shared manager behind one of these:
+    the manager's semaphores, sessions and connection pools bind to the
+    first loop that touches them, and a second loop would trip
+    "bound to a different event loop" errors — hand MCPClientWrapper the
+    serving loop instead.
+    """
+
+    def __init__(self, name: str = "mcp-async-loop"):
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """The loop owned by this thread, e.g. to hand to MCPClientWrapper"""
+        return self._loop
+
+    def _run(self):
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_forever()
+
+    def submit(self, coro: Coroutine) -> concurrent.futures.Future:
+        """Schedule a coroutine on the loop; returns a concurrent Future"""
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)
+
+    def stop(self):
+        """Stop the loop and join the thread"""
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5)
+
+class MCPClientWrapper:
+    """Synchronous facade over MCPClientManager for multi-threaded callers.
+
+    Each method submits the underlying coroutine onto the manager's own
+    loop with run_coroutine_threadsafe and blocks on the result, so worker
+    threads (executor-run tools, sync integrations) can issue MCP calls
+    without juggling loops themselves. The loop must be the one the
+    manager already lives on — the serving loop in the gateway, or an
+    AsyncLoopThread's loop in a standalone process.
+    """
+
+    def __init__(self, manager, loop: asyncio.AbstractEventLoop, timeout: Optional[float] = None):
+        self._manager = manager
+        self._loop = loop
+        self._timeout = timeout
+
+    def _submit(self, coro: Coroutine) -> concurrent.futures.Future:
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)
+
+    def process_message(self, message: str, session_id: str = "default") -> Tuple[str, List[str]]:
+        """Synchronously process a chat message"""
+        future = self._submit(self._manager.process_message(message, session_id))
+        return future.result(self._timeout)
+
+    def get_available_tools(self) -> List[str]:
+        """Synchronously list available tools"""
+        future = self._submit(self._manager.get_available_tools())
+        return future.result(self._timeout)
+
+    def gather(self, *coros: Coroutine) -> List[Any]:
+        """Fan several coroutines out on the manager's loop and wait for all"""
+        # asyncio.gather must run on the loop itself: called here it would
+        # both hand _submit a Future instead of a coroutine and try to
+        # schedule against a loop that isn't running in this thread
+        async def _gather_all():
+            return await asyncio.gather(*coros)
+
+        future = self._submit(_gather_all())
+        return future.result(self._timeout)
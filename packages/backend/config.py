@@ -2,6 +2,7 @@
 import os
 import json
 import logging
+import httpx
 from typing import Dict, List, Any, Optional, Union
 from pydantic import Field, field_validator
 from pydantic_settings import BaseSettings
@@ -26,6 +27,7 @@ class LLMConfig(BaseSettings):
     presence_penalty: float = Field(0.0, env="LLM_PRESENCE_PENALTY", description="Presence penalty (-2.0 to 2.0)")
     
     # Request Configuration
+    max_concurrency: int = Field(32, env="LLM_MAX_CONCURRENCY", description="Maximum concurrent LLM invocations")
     request_timeout: float = Field(60.0, env="LLM_REQUEST_TIMEOUT", description="Request timeout in seconds")
     max_retries: int = Field(3, env="LLM_MAX_RETRIES", description="Maximum number of retries")
     retry_delay: float = Field(1.0, env="LLM_RETRY_DELAY", description="Delay between retries in seconds")
@@ -36,6 +38,11 @@ class LLMConfig(BaseSettings):
     http_max_connections: int = Field(100, env="HTTP_MAX_CONNECTIONS", description="Maximum HTTP connections")
     http_max_keepalive_connections: int = Field(20, env="HTTP_MAX_KEEPALIVE_CONNECTIONS", description="Maximum keepalive connections")
     
+    # Request Batching Configuration
+    batch_enabled: bool = Field(False, env="LLM_BATCH_ENABLED", description="Enable chat request batching")
+    batch_window_ms: int = Field(10, env="LLM_BATCH_WINDOW_MS", description="Batching window in milliseconds")
+    batch_max: int = Field(8, env="LLM_BATCH_MAX", description="Maximum requests per batch")
+
     # Streaming Configuration
     streaming: bool = Field(False, env="LLM_STREAMING", description="Enable streaming responses")
     stream_chunk_size: int = Field(1024, env="LLM_STREAM_CHUNK_SIZE", description="Streaming chunk size")
@@ -91,6 +98,7 @@ class LangChainConfig(BaseSettings):
     tool_parallel_execution: bool = Field(True, env="TOOL_PARALLEL_EXECUTION", description="Enable parallel tool execution")
     
     # Memory Configuration
+    history_window: int = Field(20, env="HISTORY_WINDOW", description="Messages of per-session history passed to the agent")
     memory_type: str = Field("buffer", env="MEMORY_TYPE", description="Memory type (buffer, summary, etc.)")
     memory_max_token_limit: int = Field(2000, env="MEMORY_MAX_TOKEN_LIMIT", description="Maximum tokens in memory")
     memory_return_messages: bool = Field(True, env="MEMORY_RETURN_MESSAGES", description="Return messages in memory")
@@ -135,13 +143,13 @@ class GatewayConfig(BaseSettings):
     workers: int = Field(1, env="GATEWAY_WORKERS", description="Number of worker processes")
     
     # CORS Configuration
-    cors_origins: str = Field(
+    cors_origins: Union[str, List[str]] = Field(
         "http://localhost:3000,http://127.0.0.1:3000,http://localhost:8080,http://127.0.0.1:8080",
         env="CORS_ORIGINS",
         description="Comma-separated CORS origins"
     )
     cors_credentials: bool = Field(True, env="CORS_CREDENTIALS", description="Allow CORS credentials")
-    cors_methods: str = Field("GET,POST,PUT,DELETE,OPTIONS", env="CORS_METHODS", description="Allowed CORS methods")
+    cors_methods: Union[str, List[str]] = Field("GET,POST,PUT,DELETE,OPTIONS", env="CORS_METHODS", description="Allowed CORS methods")
     cors_headers: str = Field("*", env="CORS_HEADERS", description="Allowed CORS headers")
     
     # Rate Limiting
@@ -157,27 +165,14 @@ class GatewayConfig(BaseSettings):
     # Security Configuration
     api_key_header: str = Field("X-API-Key", env="API_KEY_HEADER", description="API key header name")
     require_api_key: bool = Field(False, env="REQUIRE_API_KEY", description="Require API key for requests")
-    allowed_api_keys: str = Field("", env="ALLOWED_API_KEYS", description="Comma-separated allowed API keys")
-    
-    @field_validator('cors_origins')
-    @classmethod
-    def parse_cors_origins(cls, v):
-        if isinstance(v, str):
-            return [origin.strip() for origin in v.split(',') if origin.strip()]
-        return v
-    
-    @field_validator('cors_methods')
-    @classmethod
-    def parse_cors_methods(cls, v):
-        if isinstance(v, str):
-            return [method.strip() for method in v.split(',') if method.strip()]
-        return v
-    
-    @field_validator('allowed_api_keys')
+    allowed_api_keys: Union[str, List[str]] = Field("", env="ALLOWED_API_KEYS", description="Comma-separated allowed API keys")
+
+    @field_validator('cors_origins', 'cors_methods', 'allowed_api_keys', mode='before')
     @classmethod
-    def parse_api_keys(cls, v):
+    def parse_comma_separated(cls, v):
+        """Normalize comma-separated strings to lists once, at config load time"""
         if isinstance(v, str):
-            return [key.strip() for key in v.split(',') if key.strip()]
+            return [item.strip() for item in v.split(',') if item.strip()]
         return v
 
 class CacheConfig(BaseSettings):
@@ -210,20 +205,45 @@ class Config:
         self.mcp = MCPConfig()
         self.gateway = GatewayConfig()
         self.cache = CacheConfig()
-        
+
         # Setup logging based on configuration
         self._setup_logging()
-    
+
+        # Precompute derived values once; the sub-models are settings
+        # singletons so these never change after construction
+        self._environment = os.getenv('ENVIRONMENT', 'development').lower()
+        self._llm_kwargs = self._build_llm_kwargs()
+        self._http_client_kwargs = self._build_http_client_kwargs()
+
     def _setup_logging(self):
         """Setup logging configuration"""
-        logging.basicConfig(
-            level=getattr(logging, self.gateway.log_level.upper()),
-            format=self.gateway.log_format,
-            filename=self.gateway.log_file
-        )
+        import atexit
+        import queue
+        from logging.handlers import QueueHandler, QueueListener
+
+        # Compile the format string into a Formatter once
+        formatter = logging.Formatter(self.gateway.log_format)
+
+        if self.gateway.log_file:
+            handler = logging.FileHandler(self.gateway.log_file)
+        else:
+            handler = logging.StreamHandler()
+        handler.setFormatter(formatter)
+
+        # Route records through a queue so formatting and I/O happen on the
+        # listener thread instead of blocking the event loop
+        log_queue: queue.SimpleQueue = queue.SimpleQueue()
+        root = logging.getLogger()
+        root.setLevel(getattr(logging, self.gateway.log_level.upper()))
+        root.handlers.clear()
+        root.addHandler(QueueHandler(log_queue))
+
+        self._log_listener = QueueListener(log_queue, handler)
+        self._log_listener.start()
+        atexit.register(self._log_listener.stop)
     
-    def get_llm_kwargs(self) -> Dict[str, Any]:
-        """Get LLM initialization kwargs"""
+    def _build_llm_kwargs(self) -> Dict[str, Any]:
+        """Build LLM initialization kwargs (computed once at construction)"""
         kwargs = {
             'model': self.llm.openai_model,
             'openai_api_key': self.llm.openai_api_key,
@@ -244,13 +264,11 @@ class Config:
             kwargs['openai_organization'] = self.llm.openai_organization
         if self.llm.openai_api_version:
             kwargs['openai_api_version'] = self.llm.openai_api_version
-        
+
         return kwargs
-    
-    def get_http_client_kwargs(self) -> Dict[str, Any]:
-        """Get HTTP client initialization kwargs"""
-        import httpx
-        
+
+    def _build_http_client_kwargs(self) -> Dict[str, Any]:
+        """Build HTTP client initialization kwargs (computed once at construction)"""
         return {
             'timeout': self.llm.http_timeout,
             'verify': self.llm.http_verify_ssl,
@@ -259,7 +277,17 @@ class Config:
                 max_keepalive_connections=self.llm.http_max_keepalive_connections,
             )
         }
-    
+
+    def get_llm_kwargs(self) -> Dict[str, Any]:
+        """Get LLM initialization kwargs"""
+        # Return a copy so callers can add per-instance entries without
+        # polluting the cached kwargs
+        return dict(self._llm_kwargs)
+
+    def get_http_client_kwargs(self) -> Dict[str, Any]:
+        """Get HTTP client initialization kwargs"""
+        return dict(self._http_client_kwargs)
+
     def get_agent_kwargs(self) -> Dict[str, Any]:
         """Get agent initialization kwargs for create_react_agent"""
         kwargs = {}
@@ -273,25 +301,13 @@ class Config:
             
         return kwargs
     
-    def get_cors_origins(self) -> List[str]:
-        """Get CORS origins as list"""
-        if isinstance(self.gateway.cors_origins, list):
-            return self.gateway.cors_origins
-        return [origin.strip() for origin in self.gateway.cors_origins.split(',') if origin.strip()]
-    
-    def get_cors_methods(self) -> List[str]:
-        """Get CORS methods as list"""
-        if isinstance(self.gateway.cors_methods, list):
-            return self.gateway.cors_methods
-        return [method.strip() for method in self.gateway.cors_methods.split(',') if method.strip()]
-    
     def is_development(self) -> bool:
         """Check if running in development mode"""
-        return os.getenv('ENVIRONMENT', 'development').lower() == 'development'
-    
+        return self._environment == 'development'
+
     def is_production(self) -> bool:
         """Check if running in production mode"""
-        return os.getenv('ENVIRONMENT', 'development').lower() == 'production'
+        return self._environment == 'production'
 
 # Global configuration instance
 config = Config()
@@ -1,18 +1,24 @@
 # Example usage of MCP Gateway
 import asyncio
-import json
+import orjson
 import aiohttp
+from pathlib import Path
+
+from aio_utils import to_thread_fast
 
 async def demo_gateway_usage():
     """Demonstrate how to use the MCP Gateway"""
-    
-    # Load the example OpenAPI specification
-    with open("example_openapi_spec.json", "r") as f:
-        openapi_spec = json.load(f)
+
+    # Load the example OpenAPI specification off the event loop
+    # (orjson parses large specs much faster than stdlib json)
+    spec_bytes = Path("example_openapi_spec.json").read_bytes()
+    openapi_spec = await to_thread_fast(orjson.loads, spec_bytes)
     
     gateway_url = "http://localhost:8090"
-    
-    async with aiohttp.ClientSession() as session:
+
+    # Reuse pooled keep-alive connections for all demo requests
+    connector = aiohttp.TCPConnector(limit=32)
+    async with aiohttp.ClientSession(connector=connector) as session:
         print("🚀 MCP Gateway Demo")
         
         # 1. Register the user service from OpenAPI spec
@@ -26,38 +32,51 @@ async def demo_gateway_usage():
         async with session.post(f"{gateway_url}/register-service", json=registration_data) as response:
             result = await response.json()
             print(f"✅ {result}")
-        
-        # Wait a moment for the service to fully initialize
-        await asyncio.sleep(2)
+
+        # Poll the readiness endpoint with backoff instead of sleeping a
+        # fixed 2s — typically ready in well under 200ms
+        for delay in (0.05, 0.1, 0.2, 0.4, 0.8):
+            async with session.get(f"{gateway_url}/ready/user_service") as response:
+                if (await response.json())["ready"]:
+                    break
+            await asyncio.sleep(delay)
         
         # 2. Now use the chat interface to interact with the API
         print("\n💬 Using Chat Interface...")
         
         chat_queries = [
             "Get me information about user with ID 1",
-            "Show me all users in the system", 
+            "Show me all users in the system",
             "Get posts from user ID 2",
             "What information do you have about users?"
         ]
-        
-        for query in chat_queries:
-            print(f"\n🤖 User: {query}")
-            
+
+        async def send_chat_query(index: int, query: str):
+            """Send a single chat query on its own session ID"""
             chat_data = {
                 "message": query,
-                "session_id": "demo_session"
+                "session_id": f"demo_session_{index}"
             }
-            
+
             async with session.post(f"{gateway_url}/chat", json=chat_data) as response:
                 if response.status == 200:
-                    data = await response.json()
-                    print(f"🤖 Assistant: {data['response']}")
-                    if data.get('tools_used'):
-                        print(f"🔧 Tools used: {', '.join(data['tools_used'])}")
-                else:
-                    print(f"❌ Error: {response.status}")
-            
-            await asyncio.sleep(1)  # Small delay between requests
+                    return query, await response.json()
+                return query, None
+
+        # Fire all queries concurrently — the gateway supports concurrent
+        # sessions, so total demo time is ~max latency instead of the sum
+        results = await asyncio.gather(
+            *(send_chat_query(i, q) for i, q in enumerate(chat_queries))
+        )
+
+        for query, data in results:
+            print(f"\n🤖 User: {query}")
+            if data is not None:
+                print(f"🤖 Assistant: {data['response']}")
+                if data.get('tools_used'):
+                    print(f"🔧 Tools used: {', '.join(data['tools_used'])}")
+            else:
+                print("❌ Error: chat request failed")
 
 if __name__ == "__main__":
     print("Make sure to start the gateway server first:")
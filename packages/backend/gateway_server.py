@@ -1,198 +1,309 @@
 # MCP Gateway Server - Main FastAPI application
 import asyncio
-import json
+import hashlib
 import logging
+import orjson
 from typing import Dict, List, Any, Optional
+from collections import defaultdict
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, ConfigDict, ValidationError
+import httpx
 import uvicorn
 
+from async_loop import MCPClientWrapper
 from mcp_client_manager import MCPClientManager
 from openapi_mcp_generator import OpenAPIMCPGenerator
 from config import config
 
 logger = logging.getLogger(__name__)
+# Pre-bound method aliases: hot paths log often enough that skipping the
+# per-call attribute lookup is worth it
+_debug = logger.debug
+_info = logger.info
+_warning = logger.warning
+_error = logger.error
 
+_HTTP_METHODS = frozenset({"get", "post", "put", "delete", "patch"})
+
+# Immutable request/response models: frozen instances skip mutability
+# bookkeeping, and request models ignore unknown fields instead of
+# spending validation time rejecting them
 class ChatRequest(BaseModel):
+    model_config = ConfigDict(frozen=True, extra='ignore', str_strip_whitespace=True)
+
     message: str
     session_id: Optional[str] = "default"
 
 class ChatResponse(BaseModel):
+    model_config = ConfigDict(frozen=True, extra='forbid')
+
     response: str
     tools_used: List[str] = []
     session_id: str
 
 class OpenAPIConfig(BaseModel):
+    model_config = ConfigDict(frozen=True, extra='ignore')
+
     name: str
     openapi_spec: Dict[str, Any]
     base_url: str
 
+class ChatBatcher:
+    """Coalesce concurrent chat requests into small batches.
+
+    Requests arriving within a short window are drained from a queue and
+    dispatched together, amortizing per-request scheduling overhead across
+    concurrent users while adding at most the window to latency.
+    """
+
+    def __init__(self, process_func, window_ms: int, batch_max: int):
+        self._process = process_func
+        self._window = window_ms / 1000.0
+        self._batch_max = batch_max
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        """Start the background batching task"""
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Cancel the background batching task and fail pending requests"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        # Fail anything still queued so waiting /chat callers get a
+        # response instead of hanging past shutdown
+        while True:
+            try:
+                _, future = self._queue.get_nowait()
+            except asyncio.QueueEmpty:
+                break
+            self._fail_future(future)
+
+    @staticmethod
+    def _fail_future(future: asyncio.Future):
+        if not future.done():
+            future.set_exception(
+                HTTPException(status_code=503, detail="Gateway is shutting down")
+            )
+
+    async def submit(self, request: "ChatRequest") -> "ChatResponse":
+        """Enqueue a chat request and wait for its response"""
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((request, future))
+        return await future
+
+    async def _run(self):
+        while True:
+            # Block for the first request, then give the window a chance
+            # to accumulate more before dispatching
+            batch = [await self._queue.get()]
+            await asyncio.sleep(self._window)
+            while len(batch) < self._batch_max:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
+
+            if len(batch) > 1:
+                _info("Dispatching chat batch of %d requests", len(batch))
+
+            try:
+                results = await asyncio.gather(
+                    *(self._process(request) for request, _ in batch),
+                    return_exceptions=True
+                )
+            except asyncio.CancelledError:
+                # Cancelled mid-batch (shutdown): fail the in-flight
+                # futures rather than abandoning their submitters
+                for _, future in batch:
+                    self._fail_future(future)
+                raise
+            for (_, future), result in zip(batch, results):
+                if future.cancelled():
+                    continue
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+
 class GatewayServer:
     def __init__(self):
         self.client_manager = MCPClientManager()
         self.openapi_generator = OpenAPIMCPGenerator()
         self.active_servers: Dict[str, Any] = {}
-        
+        self.batcher: Optional[ChatBatcher] = None
+        self.http_client: Optional[httpx.AsyncClient] = None
+        # Sync facade for thread-based callers (executor-run tools, sync
+        # integrations); it submits onto the serving loop, where all the
+        # manager's loop-bound state (semaphores, sessions, pools) lives
+        self.sync_client: Optional[MCPClientWrapper] = None
+        # Generated tools keyed by spec hash, so re-registering an
+        # identical spec skips tool generation entirely
+        self._spec_cache: Dict[str, Any] = {}
+        # Per-service locks so register/delete of the same name serialize
+        # while different services proceed concurrently
+        self._service_locks: Dict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+
     async def initialize(self):
         """Initialize the gateway server"""
-        await self.client_manager.initialize()
-        logger.info("MCP Gateway Server initialized")
-        
-    async def register_openapi_service(self, config: OpenAPIConfig) -> str:
-        """Register a new service from OpenAPI specification"""
-        
-        # 🔍 DEBUG: Log service registration details
-        logger.info("🔧 SERVICE REGISTRATION STARTED")
-        logger.info("="*70)
-        logger.info(f"📝 Service Name: {config.name}")
-        logger.info(f"🌐 Base URL: {config.base_url}")
-        logger.info(f"📋 OpenAPI Version: {config.openapi_spec.get('openapi', 'unknown')}")
-        logger.info(f"📊 API Title: {config.openapi_spec.get('info', {}).get('title', 'unknown')}")
-        
-        # Count paths and operations
-        paths = config.openapi_spec.get('paths', {})
-        total_operations = 0
-        for path, methods in paths.items():
-            for method in methods.keys():
-                if method.lower() in ['get', 'post', 'put', 'delete', 'patch']:
-                    total_operations += 1
-        
-        logger.info(f"🛤️  API Paths: {len(paths)}")
-        logger.info(f"⚡ Total Operations: {total_operations}")
+        # One shared HTTP client for the whole process: connections (and TLS
+        # handshakes) are reused across requests, and HTTP/2 multiplexes
+        # concurrent LLM/tool calls over the same connection
+        self.http_client = httpx.AsyncClient(**config.get_http_client_kwargs(), http2=True)
+        await self.client_manager.initialize(http_client=self.http_client)
+        self.sync_client = MCPClientWrapper(self.client_manager, asyncio.get_running_loop())
+        if config.llm.batch_enabled:
+            self.batcher = ChatBatcher(
+                self.chat,
+                window_ms=config.llm.batch_window_ms,
+                batch_max=config.llm.batch_max
+            )
+            self.batcher.start()
+            _info("Chat batching enabled (window=%dms, max=%d)", config.llm.batch_window_ms, config.llm.batch_max)
+        _info("MCP Gateway Server initialized")
         
-        try:
-            logger.info("🔄 Generating MCP tools from OpenAPI specification...")
-            
-            # Generate MCP tools from OpenAPI spec
-            server_port = await self.openapi_generator.create_mcp_server(
-                name=config.name,
-                openapi_spec=config.openapi_spec,
-                base_url=config.base_url
+    async def register_openapi_service(self, config: OpenAPIConfig, canonical: Optional[bytes] = None) -> str:
+        """Register a new service from OpenAPI specification
+
+        `canonical` carries pre-sorted spec bytes from the endpoint so the
+        fingerprint below doesn't re-serialize a potentially multi-MB spec.
+        """
+        _debug("Registering service %s (base_url=%s)", config.name, config.base_url)
+
+        # Count paths and operations — only when the line will actually emit
+        if logger.isEnabledFor(logging.DEBUG):
+            paths = config.openapi_spec.get('paths', {})
+            total_operations = sum(
+                1 for methods in paths.values() for m in methods if m.lower() in _HTTP_METHODS
             )
-            
-            # Get the generated tools and add them directly to the client manager
-            server_info = self.openapi_generator.active_servers[config.name]
-            tools = server_info["tools"]
-            
-            logger.info(f"✅ Generated {len(tools)} MCP tools")
-            
-            # Log each generated tool
-            for i, tool in enumerate(tools, 1):
-                tool_name = getattr(tool, 'name', 'unknown')
-                tool_desc = getattr(tool, 'description', 'No description')[:100]
-                logger.info(f"  🛠️  Tool {i}: {tool_name} - {tool_desc}")
-            
-            logger.info("🔄 Adding tools to MCP Client Manager...")
-            await self.client_manager.add_direct_tools(config.name, tools)
-            
-            self.active_servers[config.name] = {
-                "port": server_port,
-                "config": config,
-                "tools_count": len(tools)
-            }
-            
-            logger.info("="*50)
-            logger.info("✅ SERVICE REGISTRATION COMPLETED")
-            logger.info("="*50)
-            logger.info(f"🎯 Service: {config.name}")
-            logger.info(f"🔧 Tools Generated: {len(tools)}")
-            logger.info(f"🚀 Port Assigned: {server_port}")
-            logger.info(f"📊 Total Active Services: {len(self.active_servers)}")
-            logger.info("="*70)
-            
-            return f"Service {config.name} registered successfully with {len(tools)} tools"
-            
-        except Exception as e:
-            logger.error("💥 SERVICE REGISTRATION FAILED")
-            logger.error("="*50)
-            logger.error(f"🔥 Failed to register OpenAPI service {config.name}")
-            logger.error(f"📝 Error: {e}")
-            logger.error(f"🔍 Error Type: {type(e).__name__}")
-            import traceback
-            logger.error(f"📚 Traceback:\n{traceback.format_exc()}")
-            logger.error("="*70)
-            raise HTTPException(status_code=500, detail=str(e))
+            _debug("Spec for %s: paths=%d operations=%d", config.name, len(paths), total_operations)
+
+        # Serialize mutations per service so concurrent registrations or
+        # deletions of the same name cannot interleave
+        async with self._service_locks[config.name]:
+            try:
+                # Generated tools are a pure function of spec content plus the
+                # base URL baked into each tool, so key the cache on both and
+                # repeat registrations skip generation entirely.
+                # BLAKE2b is faster than SHA-256 and we don't need crypto strength
+                if canonical is None:
+                    canonical = orjson.dumps(config.openapi_spec, option=orjson.OPT_SORT_KEYS)
+                spec_hash = hashlib.blake2b(
+                    canonical + config.base_url.encode(),
+                    digest_size=16
+                ).hexdigest()
+
+                cached = self._spec_cache.get(spec_hash)
+                if cached is not None:
+                    server_port, tools = cached
+                    _debug("Reusing %d cached tools for spec %s", len(tools), spec_hash)
+                else:
+                    # Generate MCP tools from OpenAPI spec
+                    server_port = await self.openapi_generator.create_mcp_server(
+                        name=config.name,
+                        openapi_spec=config.openapi_spec,
+                        base_url=config.base_url
+                    )
+
+                    # Get the generated tools and add them directly to the client manager
+                    server_info = self.openapi_generator.active_servers[config.name]
+                    tools = server_info["tools"]
+                    self._spec_cache[spec_hash] = (server_port, tools)
+
+                if logger.isEnabledFor(logging.DEBUG):
+                    for i, tool in enumerate(tools, 1):
+                        _debug("  tool %d: %s", i, getattr(tool, 'name', 'unknown'))
+
+                await self.client_manager.add_direct_tools(config.name, tools)
+
+                self.active_servers[config.name] = {
+                    "port": server_port,
+                    "config": config,
+                    "tools_count": len(tools)
+                }
+
+                _info("Registered service %s: tools=%d port=%d active_services=%d",
+                            config.name, len(tools), server_port, len(self.active_servers))
+
+                return f"Service {config.name} registered successfully with {len(tools)} tools"
+
+            except Exception as e:
+                # logger.exception only walks the traceback when a handler emits
+                logger.exception("Failed to register OpenAPI service %s", config.name)
+                raise HTTPException(status_code=500, detail=str(e))
     
     async def delete_openapi_service(self, service_name: str) -> str:
         """Delete a registered OpenAPI service"""
-        try:
-            # Check if service exists
-            if service_name not in self.active_servers:
-                raise HTTPException(status_code=404, detail=f"Service {service_name} not found")
+        async with self._service_locks[service_name]:
+            try:
+                # Check if service exists
+                if service_name not in self.active_servers:
+                    raise HTTPException(status_code=404, detail=f"Service {service_name} not found")
             
-            # Remove from active servers
-            service_info = self.active_servers.pop(service_name)
+                # Remove from active servers
+                service_info = self.active_servers.pop(service_name)
             
-            # Remove from OpenAPI generator
-            if service_name in self.openapi_generator.active_servers:
-                del self.openapi_generator.active_servers[service_name]
+                # Remove from OpenAPI generator
+                if service_name in self.openapi_generator.active_servers:
+                    del self.openapi_generator.active_servers[service_name]
             
-            # Remove from client manager
-            await self.client_manager.remove_direct_tools(service_name)
+                # Remove from client manager
+                await self.client_manager.remove_direct_tools(service_name)
             
-            logger.info(f"Deleted OpenAPI service: {service_name}")
-            return f"Service {service_name} deleted successfully"
+                _info("Deleted OpenAPI service: %s", service_name)
+                return f"Service {service_name} deleted successfully"
             
-        except HTTPException:
-            # Re-raise HTTP exceptions
-            raise
-        except Exception as e:
-            logger.error(f"Failed to delete OpenAPI service {service_name}: {e}")
-            raise HTTPException(status_code=500, detail=str(e))
+            except HTTPException:
+                # Re-raise HTTP exceptions
+                raise
+            except Exception as e:
+                _error("Failed to delete OpenAPI service %s: %s", service_name, e)
+                raise HTTPException(status_code=500, detail=str(e))
     
     async def chat(self, request: ChatRequest) -> ChatResponse:
         """Process chat request using available MCP tools"""
-        
-        # 🔍 DEBUG: Log incoming chat request at gateway level
-        logger.info("🌟 GATEWAY CHAT REQUEST")
-        logger.info("="*70)
-        logger.info(f"📨 Received chat request from client")
-        logger.info(f"💬 Message: {request.message}")
-        logger.info(f"🔑 Session ID: {request.session_id}")
-        logger.info(f"📊 Active Services: {len(self.active_servers)}")
-        logger.info(f"🔧 Available Services: {list(self.active_servers.keys())}")
-        
+        if logger.isEnabledFor(logging.DEBUG):
+            _debug("Chat request session=%s len=%d services=%d",
+                         request.session_id, len(request.message), len(self.active_servers))
+
         try:
-            # Get response from MCP client manager
-            logger.info("🔄 Forwarding to MCP Client Manager...")
-            
             response, tools_used = await self.client_manager.process_message(
                 message=request.message,
                 session_id=request.session_id
             )
-            
-            # 🔍 DEBUG: Log gateway response
-            logger.info("📤 GATEWAY RESPONSE")
-            logger.info("="*50)
-            logger.info(f"🎯 Tools Used: {tools_used}")
-            logger.info(f"📝 Response Length: {len(response)} characters")
-            response_preview = response[:200] + "..." if len(response) > 200 else response
-            logger.info(f"💭 Response Preview: {response_preview}")
-            logger.info("="*70)
-            
+
+            if logger.isEnabledFor(logging.DEBUG):
+                _debug("Chat response session=%s tools=%s len=%d",
+                             request.session_id, tools_used, len(response))
+
             return ChatResponse(
                 response=response,
                 tools_used=tools_used,
                 session_id=request.session_id
             )
-            
+
         except Exception as e:
-            logger.error("💥 GATEWAY CHAT ERROR")
-            logger.error("="*50)
-            logger.error(f"🔥 Error in gateway chat processing: {e}")
-            logger.error(f"📝 Error Type: {type(e).__name__}")
-            import traceback
-            logger.error(f"📚 Traceback:\n{traceback.format_exc()}")
-            logger.error("="*70)
+            logger.exception("Chat processing failed for session %s", request.session_id)
             raise HTTPException(status_code=500, detail=f"Chat processing failed: {str(e)}")
     
     async def shutdown(self):
         """Cleanup resources"""
+        if self.batcher:
+            await self.batcher.stop()
         await self.client_manager.shutdown()
         await self.openapi_generator.shutdown()
+        if self.http_client:
+            await self.http_client.aclose()
 
 # Global gateway instance
 gateway = GatewayServer()
@@ -210,23 +321,43 @@ app = FastAPI(
     title="MCP Gateway",
     description="A gateway server that exposes chat endpoints backed by MCP servers generated from OpenAPI specs",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
-# Add CORS middleware with configuration
+# CORS configuration computed once at import: the middleware holds these
+# for the life of the process, so hand it immutable tuples instead of
+# rebuilding lists inline
+_CORS_ORIGINS = tuple(config.gateway.cors_origins)
+_CORS_METHODS = tuple(config.gateway.cors_methods)
+_CORS_HEADERS = ("*",) if config.gateway.cors_headers == "*" else (config.gateway.cors_headers,)
+
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=config.get_cors_origins(),
+    allow_origins=_CORS_ORIGINS,
     allow_credentials=config.gateway.cors_credentials,
-    allow_methods=config.get_cors_methods(),
-    allow_headers=[config.gateway.cors_headers] if config.gateway.cors_headers != "*" else ["*"],
+    allow_methods=_CORS_METHODS,
+    allow_headers=_CORS_HEADERS,
 )
 
-@app.post("/register-service", response_model=Dict[str, str])
-async def register_service(service_config: OpenAPIConfig):
+# Skipping response_model on the hot routes avoids a second Pydantic
+# validation pass over data we just built ourselves
+@app.post("/register-service", response_class=ORJSONResponse)
+async def register_service(request: Request):
     """Register a new service from OpenAPI specification"""
-    result = await gateway.register_openapi_service(service_config)
-    return {"message": result}
+    # Parse the body with orjson rather than the default json-based model
+    # parsing — for large OpenAPI specs this is the dominant CPU cost of
+    # registration — and canonicalize once for the spec cache fingerprint
+    body = await request.body()
+    try:
+        payload = orjson.loads(body)
+        service_config = OpenAPIConfig(**payload)
+    except (orjson.JSONDecodeError, ValidationError, TypeError) as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+    canonical = orjson.dumps(service_config.openapi_spec, option=orjson.OPT_SORT_KEYS)
+    result = await gateway.register_openapi_service(service_config, canonical=canonical)
+    return ORJSONResponse({"message": result})
 
 @app.delete("/delete-service/{service_name}", response_model=Dict[str, str])
 async def delete_service(service_name: str):
@@ -234,17 +365,38 @@ async def delete_service(service_name: str):
     result = await gateway.delete_openapi_service(service_name)
     return {"message": result}
 
-@app.post("/chat", response_model=ChatResponse)
+@app.post("/chat", response_class=ORJSONResponse)
 async def chat_endpoint(request: ChatRequest):
     """Chat endpoint that uses MCP tools to process requests"""
-    return await gateway.chat(request)
+    if gateway.batcher:
+        response = await gateway.batcher.submit(request)
+    else:
+        response = await gateway.chat(request)
+    return ORJSONResponse(response.model_dump())
+
+@app.delete("/clear-session/{session_id}")
+async def clear_session(session_id: str):
+    """Clear stored conversation history for a session"""
+    cleared = gateway.client_manager.clear_session(session_id)
+    return {"cleared": cleared, "session_id": session_id}
 
 @app.get("/services", response_model=Dict[str, Any])
 async def list_services():
     """List all registered services"""
+    # Shallow snapshot so readers never observe a partially-updated dict
+    # while a registration/deletion is in flight
+    snapshot = dict(gateway.active_servers)
+    return {
+        "active_servers": list(snapshot.keys()),
+        "details": snapshot
+    }
+
+@app.get("/ready/{service_name}")
+async def service_ready(service_name: str):
+    """Readiness check for a registered service"""
+    service_info = gateway.active_servers.get(service_name)
     return {
-        "active_servers": list(gateway.active_servers.keys()),
-        "details": gateway.active_servers
+        "ready": service_info is not None and service_info.get("tools_count", 0) > 0
     }
 
 @app.get("/health")
@@ -258,6 +410,10 @@ if __name__ == "__main__":
         host=config.gateway.host,
         port=config.gateway.port,
         workers=config.gateway.workers,
+        # uvloop + httptools (from uvicorn[standard]) cut event-loop and
+        # HTTP-parse CPU substantially vs the stock asyncio/h11 pair
+        loop="uvloop",
+        http="httptools",
         reload=config.is_development(),
         log_level=config.gateway.log_level.lower(),
         access_log=config.is_development()
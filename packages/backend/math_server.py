@@ -1,22 +1,27 @@
 # math_server.py
-import sys
+import logging
+import os
 from mcp.server.fastmcp import FastMCP
 
-print("Starting math server...", file=sys.stderr)
+# Synchronous stderr prints in the tool hot path dwarf the arithmetic;
+# use lazy debug logging instead (off by default)
+logging.basicConfig(level=os.getenv("MATH_LOG_LEVEL", "WARNING"))
+logger = logging.getLogger(__name__)
+
 mcp = FastMCP("Math")
 
 @mcp.tool()
 def add(a: int, b: int) -> int:
     """Add two numbers"""
-    print(f"Adding {a} + {b}", file=sys.stderr)
+    logger.debug("add %d %d", a, b)
     return a + b
 
 @mcp.tool()
 def multiply(a: int, b: int) -> int:
     """Multiply two numbers"""
-    print(f"Multiplying {a} * {b}", file=sys.stderr)
+    logger.debug("multiply %d %d", a, b)
     return a * b
 
 if __name__ == "__main__":
-    print("Running MCP server with stdio transport...", file=sys.stderr)
-    mcp.run(transport="stdio")
\ No newline at end of file
+    logger.info("Running MCP server with stdio transport...")
+    mcp.run(transport="stdio")
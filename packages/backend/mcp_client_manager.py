@@ -1,9 +1,11 @@
 # MCP Client Manager - Handles multiple MCP servers and chat processing
 import asyncio
 import logging
+import traceback
 from typing import Dict, List, Tuple, Any, Optional
 
 from langchain_mcp_adapters.client import MultiServerMCPClient
+from langchain_core.messages import ToolMessage
 from langgraph.prebuilt import create_react_agent
 from langchain.chat_models import init_chat_model
 from langchain_openai import ChatOpenAI
@@ -14,6 +16,12 @@ import ssl
 from config import config
 
 logger = logging.getLogger(__name__)
+# Pre-bound method aliases: hot paths log often enough that skipping the
+# per-call attribute lookup is worth it
+_debug = logger.debug
+_info = logger.info
+_warning = logger.warning
+_error = logger.error
 
 class MCPClientManager:
     def __init__(self):
@@ -21,16 +29,29 @@ class MCPClientManager:
         self.client: Optional[MultiServerMCPClient] = None
         self.agent = None
         self.model = None
+        self.direct_tools: Dict[str, List[Any]] = {}
+        # Per-session conversation history so the agent sees prior turns
+        # instead of re-planning every chat from scratch
+        self.sessions: Dict[str, List[Any]] = {}
+        self._tools_by_name: Dict[str, Any] = {}
+        # Cached MCP get_tools() result, invalidated on add/remove_server
+        self._mcp_tools_cache: Optional[List[Any]] = None
+        # Fingerprint of the tool set the current agent was built from
+        self._agent_fingerprint: Optional[tuple] = None
+        # Caps concurrent LLM invocations so request bursts can't open
+        # unbounded upstream connections or starve the event loop
+        self._llm_semaphore = asyncio.Semaphore(config.llm.max_concurrency)
         
-    async def initialize(self):
-        """Initialize the MCP client manager"""
+    async def initialize(self, http_client: Optional[httpx.AsyncClient] = None):
+        """Initialize the MCP client manager
+
+        Accepts a shared httpx.AsyncClient so all LLM calls reuse one
+        connection pool; falls back to creating its own when not provided.
+        """
         try:
-            # Get HTTP client configuration from config
-            http_client_kwargs = config.get_http_client_kwargs()
-            
-            # Create async HTTP client with configuration
-            async_http_client = httpx.AsyncClient(**http_client_kwargs)
-            
+            # Use the shared HTTP client if given, otherwise build one
+            async_http_client = http_client or httpx.AsyncClient(**config.get_http_client_kwargs())
+
             # Get LLM configuration from config
             llm_kwargs = config.get_llm_kwargs()
             llm_kwargs['http_async_client'] = async_http_client
@@ -38,22 +59,22 @@ class MCPClientManager:
             # Initialize ChatOpenAI with configuration
             self.model = ChatOpenAI(**llm_kwargs)
             
-            logger.info(f"MCP Client Manager initialized with model: {config.llm.openai_model}")
-            logger.info(f"SSL verification: {config.llm.http_verify_ssl}")
-            logger.info(f"Temperature: {config.llm.temperature}")
-            logger.info(f"Max tokens: {config.llm.max_tokens}")
+            _info(f"MCP Client Manager initialized with model: {config.llm.openai_model}")
+            _info(f"SSL verification: {config.llm.http_verify_ssl}")
+            _info(f"Temperature: {config.llm.temperature}")
+            _info(f"Max tokens: {config.llm.max_tokens}")
             
         except Exception as e:
-            logger.error(f"Failed to initialize model: {e}")
+            _error(f"Failed to initialize model: {e}")
             
             # Fallback to default initialization if enabled
             if config.llm.enable_fallback:
                 try:
                     fallback_model = config.llm.fallback_model or f"openai:{config.llm.openai_model}"
                     self.model = init_chat_model(fallback_model)
-                    logger.info(f"MCP Client Manager initialized with fallback model: {fallback_model}")
+                    _info(f"MCP Client Manager initialized with fallback model: {fallback_model}")
                 except Exception as fallback_error:
-                    logger.error(f"Fallback initialization also failed: {fallback_error}")
+                    _error(f"Fallback initialization also failed: {fallback_error}")
                     raise
             else:
                 raise
@@ -61,40 +82,45 @@ class MCPClientManager:
     async def add_server(self, name: str, config: Dict[str, Any]):
         """Add a new MCP server configuration"""
         self.servers[name] = config
+        self._mcp_tools_cache = None
         await self._rebuild_client()
-        logger.info(f"Added MCP server: {name}")
-    
+        _info(f"Added MCP server: {name}")
+
     async def add_direct_tools(self, name: str, tools: List[Any]):
         """Add tools directly without going through MCP server"""
         # For now, we'll create a simple agent with these tools directly
-        if not hasattr(self, 'direct_tools'):
-            self.direct_tools = {}
-        
         self.direct_tools[name] = tools
         await self._rebuild_client_with_direct_tools()
-        logger.info(f"Added {len(tools)} direct tools for: {name}")
+        _info(f"Added {len(tools)} direct tools for: {name}")
+
+    async def bulk_add_direct_tools(self, items: Dict[str, List[Any]]):
+        """Add direct tools for several services with a single agent rebuild"""
+        self.direct_tools.update(items)
+        await self._rebuild_client_with_direct_tools()
+        _info(f"Added direct tools for {len(items)} services in one rebuild")
     
     async def remove_direct_tools(self, name: str):
         """Remove direct tools for a service"""
-        if hasattr(self, 'direct_tools') and name in self.direct_tools:
+        if name in self.direct_tools:
             tools_count = len(self.direct_tools[name])
             del self.direct_tools[name]
             await self._rebuild_client_with_direct_tools()
-            logger.info(f"Removed {tools_count} direct tools for: {name}")
+            _info(f"Removed {tools_count} direct tools for: {name}")
         else:
-            logger.warning(f"No direct tools found for service: {name}")
+            _warning(f"No direct tools found for service: {name}")
     
     async def remove_server(self, name: str):
         """Remove an MCP server"""
         if name in self.servers:
             del self.servers[name]
+            self._mcp_tools_cache = None
             await self._rebuild_client()
-            logger.info(f"Removed MCP server: {name}")
+            _info(f"Removed MCP server: {name}")
         
-        if hasattr(self, 'direct_tools') and name in self.direct_tools:
+        if name in self.direct_tools:
             del self.direct_tools[name]
             await self._rebuild_client_with_direct_tools()
-            logger.info(f"Removed direct tools for: {name}")
+            _info(f"Removed direct tools for: {name}")
     
     async def _rebuild_client(self):
         """Rebuild the MCP client with current server configurations"""
@@ -107,19 +133,34 @@ class MCPClientManager:
             # Create new client with all servers
             self.client = MultiServerMCPClient(self.servers)
             
-            # Get tools from all servers
-            tools = await self.client.get_tools()
-            
+            # Fetch tool lists from all servers concurrently — get_tools()
+            # with no argument walks the servers one at a time, so rebuild
+            # latency would be the sum of per-server round-trips
+            tool_lists = await asyncio.gather(
+                *(self.client.get_tools(server_name=name) for name in self.servers),
+                return_exceptions=True
+            )
+            tools = []
+            for name, result in zip(self.servers, tool_lists):
+                if isinstance(result, Exception):
+                    # Skip unreachable servers instead of aborting the rebuild
+                    _warning(f"Could not get tools from server {name}: {result}")
+                else:
+                    tools.extend(result)
+            self._mcp_tools_cache = tools
+
             # Get agent configuration from config
             agent_kwargs = config.get_agent_kwargs()
-            
+
             # Create new agent with tools and configuration
             self.agent = create_react_agent(self.model, tools, **agent_kwargs)
-            
-            logger.info(f"Rebuilt MCP client with {len(self.servers)} servers and {len(tools)} tools")
+            self._tools_by_name = {getattr(t, 'name', str(t)): t for t in tools}
+            self._agent_fingerprint = None
+
+            _info(f"Rebuilt MCP client with {len(self.servers)} servers and {len(tools)} tools")
             
         except Exception as e:
-            logger.error(f"Failed to rebuild MCP client: {e}")
+            _error(f"Failed to rebuild MCP client: {e}")
             self.client = None
             self.agent = None
             raise
@@ -129,58 +170,177 @@ class MCPClientManager:
         try:
             # Collect all direct tools
             all_tools = []
-            if hasattr(self, 'direct_tools'):
-                for service_name, tools in self.direct_tools.items():
-                    all_tools.extend(tools)
-            
-            # Also add any MCP server tools if they exist
+            for service_name, tools in self.direct_tools.items():
+                all_tools.extend(tools)
+
+            # Also add any MCP server tools if they exist, using the cached
+            # list to avoid one network round-trip per server per rebuild
             if self.client:
-                try:
-                    mcp_tools = await self.client.get_tools()
-                    all_tools.extend(mcp_tools)
-                except Exception as e:
-                    logger.warning(f"Could not get MCP tools: {e}")
-            
+                if self._mcp_tools_cache is None:
+                    try:
+                        self._mcp_tools_cache = await self.client.get_tools()
+                    except Exception as e:
+                        _warning(f"Could not get MCP tools: {e}")
+                if self._mcp_tools_cache:
+                    all_tools.extend(self._mcp_tools_cache)
+
             if all_tools:
+                # Skip the rebuild entirely when the tool set hasn't changed —
+                # registering N services otherwise costs O(N^2) agent builds.
+                # Fingerprint by object identity, not just name: re-registering
+                # a service with a changed spec or base_url produces fresh
+                # closures under the same operationIds, and those must rebuild
+                fingerprint = tuple(sorted(
+                    (getattr(t, 'name', str(t)), id(t)) for t in all_tools
+                ))
+                if fingerprint == self._agent_fingerprint and self.agent is not None:
+                    _debug("Tool set unchanged, keeping existing agent")
+                    return
+
                 # Get agent configuration from config
                 agent_kwargs = config.get_agent_kwargs()
-                
+
                 # Create new agent with all tools and configuration
                 self.agent = create_react_agent(self.model, all_tools, **agent_kwargs)
-                logger.info(f"Rebuilt agent with {len(all_tools)} total tools")
+                self._tools_by_name = {getattr(t, 'name', str(t)): t for t in all_tools}
+                self._agent_fingerprint = fingerprint
+                _info(f"Rebuilt agent with {len(all_tools)} total tools")
             else:
                 self.agent = None
-                logger.info("No tools available, agent set to None")
-                
+                self._tools_by_name = {}
+                self._agent_fingerprint = None
+                _info("No tools available, agent set to None")
+
         except Exception as e:
-            logger.error(f"Failed to rebuild client with direct tools: {e}")
+            _error(f"Failed to rebuild client with direct tools: {e}")
             raise
     
+    async def _invoke_tool(self, tool_call: Dict[str, Any]) -> ToolMessage:
+        """Invoke a single tool call and wrap the result (or error) as a ToolMessage"""
+        tool_name = tool_call.get('name', 'unknown')
+        tool_args = tool_call.get('args', {})
+        tool_id = tool_call.get('id', 'unknown')
+
+        tool = self._tools_by_name.get(tool_name)
+        if tool is None:
+            return ToolMessage(content=f"Error: unknown tool '{tool_name}'", tool_call_id=tool_id)
+
+        try:
+            result = await tool.ainvoke(tool_args)
+            return ToolMessage(content=str(result), tool_call_id=tool_id)
+        except Exception as e:
+            # Wrap failures as error observations so one bad call doesn't abort the batch
+            _error(f"Tool {tool_name} failed: {e}")
+            return ToolMessage(content=f"Error executing {tool_name}: {e}", tool_call_id=tool_id)
+
+    async def _execute_tool_calls(self, tool_calls: List[Dict[str, Any]]) -> List[ToolMessage]:
+        """Execute a batch of independent tool calls, in parallel when enabled"""
+        # Bound concurrency: fan out fully when parallel execution is enabled,
+        # otherwise fall back to effectively sequential execution
+        max_parallel = len(tool_calls) if config.langchain.tool_parallel_execution else 1
+        semaphore = asyncio.Semaphore(max(max_parallel, 1))
+
+        async def bounded_invoke(tool_call):
+            async with semaphore:
+                return await self._invoke_tool(tool_call)
+
+        return await asyncio.gather(*(bounded_invoke(tc) for tc in tool_calls))
+
+    async def _try_parallel_tool_path(self, messages: List[Any]) -> Optional[Tuple[str, List[str]]]:
+        """Fast path: ask the model once, execute its tool calls directly
+        (fanned out with asyncio.gather when there are several), then make
+        one final model call for the answer — bypassing the LangGraph state
+        machine entirely.
+
+        This only covers single-round tool use: if the synthesis call asks
+        for more tools, the turn needs the agent's iterate-until-done loop
+        (and its recursion_limit), so we bail out rather than reimplement it.
+
+        Returns None when the fast path doesn't apply (disabled, model can't
+        bind tools, a requested tool isn't GET-backed, or another tool round
+        is needed) so the caller can fall back to the full agent graph.
+        """
+        if not config.langchain.tool_parallel_execution:
+            return None
+        if not self._tools_by_name or not hasattr(self.model, 'bind_tools'):
+            return None
+
+        try:
+            model_with_tools = self.model.bind_tools(list(self._tools_by_name.values()))
+            async with self._llm_semaphore:
+                first_response = await model_with_tools.ainvoke(messages)
+
+            tool_calls = getattr(first_response, 'tool_calls', None) or []
+            if not tool_calls:
+                # Trivially answerable without tools — skip the graph and
+                # the would-be duplicate LLM call entirely
+                return str(first_response.content), []
+
+            # Only short-circuit rounds made entirely of GET-backed tools:
+            # if the turn later falls back to the graph, this round replays,
+            # and replaying a POST/PUT/DELETE/PATCH (or a tool whose method
+            # we can't see, e.g. from an MCP server) could mutate twice
+            for tool_call in tool_calls:
+                tool = self._tools_by_name.get(tool_call.get('name'))
+                metadata = getattr(tool, 'metadata', None) or {}
+                if metadata.get('http_method') != 'get':
+                    _debug("Tool %s is not GET-backed, deferring to agent graph",
+                           tool_call.get('name'))
+                    return None
+
+            _debug("Short-circuiting %d tool call(s) past the agent graph", len(tool_calls))
+            tool_messages = await self._execute_tool_calls(tool_calls)
+
+            # One final model call to synthesize the answer from all
+            # observations. Tools stay bound so the model can signal that it
+            # needs another round — which this path doesn't handle
+            async with self._llm_semaphore:
+                final_response = await model_with_tools.ainvoke(
+                    messages + [first_response] + list(tool_messages)
+                )
+
+            if getattr(final_response, 'tool_calls', None):
+                _debug("Fast path would need another tool round, deferring to agent graph")
+                return None
+
+            tools_used = list({tc.get('name', 'unknown') for tc in tool_calls})
+            return str(final_response.content), tools_used
+
+        except Exception as e:
+            _warning(f"Parallel tool path failed, falling back to agent: {e}")
+            return None
+
     async def process_message(self, message: str, session_id: str = "default") -> Tuple[str, List[str]]:
         """Process a chat message using available MCP tools"""
-        
-        # 🔍 DEBUG: Log incoming chat request
-        logger.info("="*80)
-        logger.info("🚀 CHAT REQUEST STARTED")
-        logger.info("="*80)
-        logger.info(f"📝 User Input: {message}")
-        logger.info(f"🔑 Session ID: {session_id}")
-        logger.info(f"⏰ Timestamp: {__import__('datetime').datetime.now().isoformat()}")
-        
+        _debug("Chat request session=%s len=%d", session_id, len(message))
+
         if not self.agent:
-            logger.warning("❌ No MCP servers available")
+            _warning("❌ No MCP servers available")
             return "No MCP servers available. Please register a service first.", []
-        
-        # 🔍 DEBUG: Log available tools
-        available_tools = []
-        if hasattr(self, 'direct_tools'):
-            for service_name, tools in self.direct_tools.items():
-                for tool in tools:
-                    tool_name = getattr(tool, 'name', 'unknown')
-                    available_tools.append(f"{service_name}.{tool_name}")
-        
-        logger.info(f"🔧 Available Tools ({len(available_tools)}): {available_tools}")
-        
+
+        # Record the turn in this session's history and hand the agent the
+        # recent window, so follow-up questions don't replan from scratch
+        history = self.sessions.setdefault(session_id, [])
+        history.append({"role": "user", "content": message})
+        window = history[-config.langchain.history_window:]
+
+        # Try the parallel tool-execution fast path before the full agent graph
+        parallel_result = await self._try_parallel_tool_path(window)
+        if parallel_result is not None:
+            response_content, tools_used = parallel_result
+            self._record_response(history, response_content)
+            _debug("Parallel tool path completed with tools: %s", tools_used)
+            return response_content, tools_used
+
+        # Enumerate the tool inventory only when the line will actually emit
+        if logger.isEnabledFor(logging.DEBUG):
+            available_tools = [
+                f"{service_name}.{getattr(tool, 'name', 'unknown')}"
+                for service_name, tools in self.direct_tools.items()
+                for tool in tools
+            ]
+            _debug("Available tools (%d): %s", len(available_tools), available_tools)
+
         try:
             # Prepare agent configuration for execution
             agent_config = {}
@@ -189,99 +349,60 @@ class MCPClientManager:
             if config.langchain.agent_max_iterations:
                 agent_config["recursion_limit"] = config.langchain.agent_max_iterations
             
-            logger.info(f"⚙️ Agent Config: {agent_config}")
-            logger.info("🤖 Invoking AI Agent...")
-            
+            _debug("Invoking agent with config %s", agent_config)
+
             # Process message with agent and configuration
-            response = await self.agent.ainvoke(
-                {"messages": [{"role": "user", "content": message}]},
-                config=agent_config
-            )
-            
-            logger.info("✅ AI Agent completed processing")
-            
-            # Extract response content and tools used
+            async with self._llm_semaphore:
+                response = await self.agent.ainvoke(
+                    {"messages": window},
+                    config=agent_config
+                )
+
+            # Extract the final response content and the set of tools used in
+            # a single pass over the messages — tool names accumulate straight
+            # into a set, and the content of the last message that has any
+            # wins as the final response
             response_content = ""
-            tools_used = []
-            tool_calls_details = []
-            
-            if "messages" in response:
-                messages = response["messages"]
-                logger.info(f"📨 Agent returned {len(messages)} messages")
-                
-                # 🔍 DEBUG: Log all messages in the conversation
+            tools_used: set = set()
+
+            messages = response.get("messages") if isinstance(response, dict) else None
+            if messages:
+                debug_enabled = logger.isEnabledFor(logging.DEBUG)
                 for i, msg in enumerate(messages):
-                    msg_type = type(msg).__name__
-                    if hasattr(msg, 'content'):
-                        content_preview = str(msg.content)[:200] + "..." if len(str(msg.content)) > 200 else str(msg.content)
-                        logger.info(f"  📄 Message {i+1} ({msg_type}): {content_preview}")
-                    
-                    # Extract tool calls with detailed information
-                    if hasattr(msg, 'tool_calls') and msg.tool_calls:
-                        logger.info(f"  🔧 Message {i+1} has {len(msg.tool_calls)} tool calls:")
-                        for j, tool_call in enumerate(msg.tool_calls):
-                            tool_name = tool_call.get('name', 'unknown')
-                            tool_args = tool_call.get('args', {})
-                            tool_id = tool_call.get('id', 'unknown')
-                            
-                            logger.info(f"    🛠️  Tool Call {j+1}:")
-                            logger.info(f"       Name: {tool_name}")
-                            logger.info(f"       ID: {tool_id}")
-                            logger.info(f"       Args: {tool_args}")
-                            
-                            tools_used.append(tool_name)
-                            tool_calls_details.append({
-                                'name': tool_name,
-                                'id': tool_id,
-                                'args': tool_args
-                            })
-                    elif isinstance(msg, dict) and 'tool_calls' in msg:
-                        logger.info(f"  🔧 Message {i+1} has {len(msg['tool_calls'])} tool calls (dict format):")
-                        for j, tool_call in enumerate(msg['tool_calls']):
-                            tool_name = tool_call.get('name', 'unknown')
-                            tool_args = tool_call.get('args', {})
-                            
-                            logger.info(f"    🛠️  Tool Call {j+1}: {tool_name} with args {tool_args}")
-                            tools_used.append(tool_name)
-                            tool_calls_details.append({
-                                'name': tool_name,
-                                'args': tool_args
-                            })
-                
-                # Get final response
-                if messages:
-                    last_message = messages[-1]
-                    if hasattr(last_message, 'content'):
-                        response_content = last_message.content
-                    elif isinstance(last_message, dict) and 'content' in last_message:
-                        response_content = last_message['content']
-            
-            # 🔍 DEBUG: Log final results
-            logger.info("="*50)
-            logger.info("📊 CHAT PROCESSING RESULTS")
-            logger.info("="*50)
-            logger.info(f"🎯 Tools Used: {list(set(tools_used))}")
-            logger.info(f"📝 Response Length: {len(str(response_content))} characters")
-            response_preview = str(response_content)[:300] + "..." if len(str(response_content)) > 300 else str(response_content)
-            logger.info(f"💬 Response Preview: {response_preview}")
-            logger.info("="*80)
-            logger.info("✅ CHAT REQUEST COMPLETED")
-            logger.info("="*80)
-            
-            return response_content or str(response), list(set(tools_used))
+                    is_dict = isinstance(msg, dict)
+                    content = msg.get('content') if is_dict else getattr(msg, 'content', None)
+                    if content:
+                        response_content = content
+
+                    tool_calls = msg.get('tool_calls') if is_dict else getattr(msg, 'tool_calls', None)
+                    if tool_calls:
+                        if debug_enabled:
+                            _debug("Message %d has %d tool calls: %s", i + 1, len(tool_calls),
+                                         [tc.get('name', 'unknown') for tc in tool_calls])
+                        tools_used.update(tc.get('name', 'unknown') for tc in tool_calls)
+
+            _debug("Agent completed, tools used: %s", tools_used)
+
+            response_content = response_content or str(response)
+            self._record_response(history, response_content)
+            return response_content, list(tools_used)
             
         except Exception as e:
-            logger.error("="*50)
-            logger.error("❌ CHAT PROCESSING ERROR")
-            logger.error("="*50)
-            logger.error(f"💥 Error Type: {type(e).__name__}")
-            logger.error(f"📝 Error Message: {str(e)}")
-            logger.error(f"🔍 Full Exception: {repr(e)}")
-            import traceback
-            logger.error(f"📚 Traceback:\n{traceback.format_exc()}")
-            logger.error("="*80)
+            _error("Chat processing failed for session %s: %s\n%s",
+                   session_id, e, traceback.format_exc())
             return f"Error processing message: {str(e)}", []
     
+    def _record_response(self, history: List[Any], content: str):
+        """Append the assistant reply and cap the session history"""
+        history.append({"role": "assistant", "content": content})
+        max_len = config.langchain.history_window * 2
+        if len(history) > max_len:
+            del history[:-max_len]
+
+    def clear_session(self, session_id: str) -> bool:
+        """Drop the stored history for a session; returns whether it existed"""
+        return self.sessions.pop(session_id, None) is not None
+
     async def get_available_tools(self) -> List[str]:
         """Get list of available tools"""
         if not self.client:
@@ -291,7 +412,7 @@ class MCPClientManager:
             tools = await self.client.get_tools()
             return [tool.name for tool in tools]
         except Exception as e:
-            logger.error(f"Failed to get tools: {e}")
+            _error(f"Failed to get tools: {e}")
             return []
     
     async def shutdown(self):
@@ -299,4 +420,4 @@ class MCPClientManager:
         if self.client:
             # Close client connections if needed
             pass
-        logger.info("MCP Client Manager shutdown complete")
+        _info("MCP Client Manager shutdown complete")
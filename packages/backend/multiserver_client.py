@@ -1,28 +1,35 @@
 import asyncio
+import os
+from pathlib import Path
+
 from dotenv import load_dotenv
 from langchain_mcp_adapters.client import MultiServerMCPClient
 from langgraph.prebuilt import create_react_agent
 
- # Load environment variables from .env file
-load_dotenv()
+# Default to the math server sitting next to this file; override with
+# MATH_SERVER_PATH when running against a different checkout
+_DEFAULT_MATH_SERVER = str(Path(__file__).parent / "math_server.py")
+
+async def main():
+    # Env loading and client construction live here, not at module level,
+    # so importing this file (tests, uvicorn --reload scans) costs nothing
+    load_dotenv()
 
-client = MultiServerMCPClient(
-    {
-        "math": {
-            "command": "python3",
-            # Make sure to update to the full absolute path to your math_server.py file
-            "args": ["/Users/syed.afroz/work/mcp/mcp-lc/math_server.py"],
-            "transport": "stdio",
-        },
-        "weather": {
-            # Make sure you start your weather server on port 8000
-            "url": "http://localhost:8000/mcp/",
-            "transport": "streamable_http",
+    client = MultiServerMCPClient(
+        {
+            "math": {
+                "command": "python3",
+                "args": [os.environ.get("MATH_SERVER_PATH", _DEFAULT_MATH_SERVER)],
+                "transport": "stdio",
+            },
+            "weather": {
+                # Make sure you start your weather server on port 8000
+                "url": "http://localhost:8000/mcp/",
+                "transport": "streamable_http",
+            }
         }
-    }
-)
+    )
 
-async def main():
     tools = await client.get_tools()
     agent = create_react_agent("openai:gpt-4.1", tools)
     math_response = await agent.ainvoke({"messages": "what's (3 + 5) x 12?"})
@@ -32,4 +39,4 @@ async def main():
     print(weather_response)
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    asyncio.run(main())
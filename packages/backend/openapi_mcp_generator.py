@@ -1,34 +1,259 @@
 # OpenAPI to MCP Server Generator
 import asyncio
+import functools
+import hashlib
 import json
 import logging
+import traceback
 import aiohttp
 from typing import Dict, List, Any, Optional, Callable
 from urllib.parse import urljoin
+import socket
 import threading
 import uvicorn
 from contextlib import asynccontextmanager
 
 from mcp.server.fastmcp import FastMCP
 from pydantic import BaseModel, create_model
-from langchain_core.tools import tool
+from langchain_core.tools import StructuredTool
 import inspect
 
+from aio_utils import to_thread_fast
+from config import config
+
 logger = logging.getLogger(__name__)
 
+# Canonical JSON bytes for fingerprinting; orjson is 2-6x faster on the
+# large specs these hashes walk, stdlib json covers its absence
+try:
+    import orjson
+    _json_loads = orjson.loads
+
+    def _json_dumps(obj: Any) -> str:
+        return orjson.dumps(obj).decode()
+
+    def _canonical_bytes(obj: Any) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS)
+except ImportError:
+    _json_loads = json.loads
+
+    def _json_dumps(obj: Any) -> str:
+        return json.dumps(obj, separators=(",", ":"))
+
+    def _canonical_bytes(obj: Any) -> bytes:
+        return json.dumps(obj, sort_keys=True).encode()
+
+# One pooled session shared by every generated tool: per-call
+# ClientSession construction costs a connector plus a TCP+TLS handshake,
+# which dwarfs most upstream API calls
+_shared_session: Optional[aiohttp.ClientSession] = None
+
+# Shared per-request objects: one ClientTimeout/header dict for every tool
+# call instead of fresh allocations, and a real upper bound on latency
+_DEFAULT_TIMEOUT = aiohttp.ClientTimeout(total=30)
+_DEFAULT_HEADERS = {"Accept": "application/json"}
+
+async def get_session() -> aiohttp.ClientSession:
+    """Return the shared keep-alive ClientSession, creating it lazily"""
+    global _shared_session
+    if _shared_session is None or _shared_session.closed:
+        _shared_session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=100, ttl_dns_cache=300, keepalive_timeout=60)
+        )
+    return _shared_session
+
+async def _invoke(
+    tool_name: str,
+    url_template: str,
+    method: str,
+    path_param_names: tuple,
+    query_param_names: tuple,
+    has_body: bool,
+    kwargs: Dict[str, Any]
+) -> str:
+    """Perform one upstream API call on behalf of a generated tool.
+
+    Every generated tool funnels through this single function with its
+    operation baked into closure arguments, rather than carrying its own
+    exec()-compiled body — one shared, cache-friendly hot path instead of
+    per-operation compiled code.
+    """
+    # Fill all path placeholders in a single formatting pass
+    if path_param_names:
+        url = url_template.format_map({name: kwargs.get(name) for name in path_param_names})
+    else:
+        url = url_template
+
+    params = None
+    if query_param_names:
+        params = {name: kwargs[name] for name in query_param_names if kwargs.get(name) is not None}
+
+    # Per-request tracing is opt-in: at default levels a tool call pays a
+    # single isEnabledFor check instead of a dozen formats and allocations
+    debug_enabled = logger.isEnabledFor(logging.DEBUG)
+
+    try:
+        if debug_enabled:
+            logger.debug("API request: tool=%s %s %s params=%s", tool_name, method, url, params)
+
+        request_kwargs: Dict[str, Any] = {
+            "params": params,
+            "timeout": _DEFAULT_TIMEOUT,
+            "headers": _DEFAULT_HEADERS
+        }
+        if has_body:
+            request_data = kwargs.get("request_data")
+            if debug_enabled:
+                logger.debug("Request body: %s", request_data)
+            request_kwargs["json"] = request_data
+
+        session = await get_session()
+
+        async with session.request(method, url, **request_kwargs) as response:
+            if response.status == 200:
+                # Decode JSON bodies once with the fast parser and re-emit
+                # compactly; anything else passes through as text
+                content_type = response.headers.get("Content-Type", "")
+                if "json" in content_type:
+                    try:
+                        result_text = _json_dumps(await response.json(loads=_json_loads))
+                    except ValueError:
+                        # Mislabeled content type; the body is cached, so
+                        # fall back to returning it verbatim
+                        result_text = await response.text()
+                else:
+                    result_text = await response.text()
+
+                if debug_enabled:
+                    preview = result_text[:500] + "..." if len(result_text) > 500 else result_text
+                    logger.debug("API response: status=%d len=%d preview=%s",
+                                 response.status, len(result_text), preview)
+                return result_text
+            else:
+                result_text = await response.text()
+                logger.error("API request failed: tool=%s %s %s status=%d body=%s",
+                             tool_name, method, url, response.status, result_text)
+                return f"Error: HTTP {response.status} - {result_text}"
+
+    except Exception as e:
+        logger.error("API request exception: tool=%s %s %s\n%s",
+                     tool_name, method, url, traceback.format_exc())
+        return f"Request failed: {str(e)}"
+
+# Minimal structural meta-schema for incoming OpenAPI documents
+_OPENAPI_METASCHEMA = {
+    "type": "object",
+    "required": ["openapi", "info", "paths"],
+    "properties": {
+        "openapi": {"type": "string"},
+        "info": {"type": "object"},
+        "paths": {"type": "object"}
+    }
+}
+
+# Compile the validator once at import: jsonschema's validator construction
+# is the expensive part, so per-registration validation stays cheap
+try:
+    import jsonschema
+    _META_VALIDATOR = jsonschema.Draft202012Validator(_OPENAPI_METASCHEMA)
+except ImportError:
+    _META_VALIDATOR = None
+
+# Path → identifier translation table: one C-level pass instead of three
+# chained str.replace scans when synthesizing fallback operation ids
+_OPID_TABLE = str.maketrans({"/": "_", "{": None, "}": None})
+
+# OpenAPI type → Python annotation dispatch table, built once at import
+_TYPE_MAPPING = {
+    "string": str,
+    "integer": int,
+    "number": float,
+    "boolean": bool,
+    "array": list,
+    "object": dict
+}
+
+def _alloc_port() -> int:
+    """Ask the OS for a free port instead of guessing from a counter"""
+    with socket.socket() as s:
+        s.bind(("", 0))
+        return s.getsockname()[1]
+
+@functools.lru_cache(maxsize=4096)
+def _shorten_operation_id(operation_id: str) -> str:
+    """Shorten an operationId to OpenAI's 64-character function-name limit.
+
+    Cached because large specs repeat the same operationIds across
+    re-registrations, and the part-by-part shortening walk isn't free.
+    """
+    if len(operation_id) <= 64:
+        return operation_id
+
+    # Try to create a shorter name while keeping it meaningful:
+    # keep the method and main resource, truncate the rest
+    parts = operation_id.split('_')
+    if len(parts) > 3:
+        short_name = f"{parts[0]}_{parts[1]}"
+        if len(short_name) < 50:  # Leave room for more parts
+            for part in parts[2:]:
+                if len(short_name + '_' + part) <= 60:  # Leave some buffer
+                    short_name += '_' + part
+                else:
+                    break
+        operation_id = short_name
+
+    # Final fallback: truncate to 64 chars
+    if len(operation_id) > 64:
+        operation_id = operation_id[:64]
+
+    return operation_id
+
 class OpenAPIMCPGenerator:
+    # Pydantic argument schemas memoized by parameter shape: operations
+    # across specs frequently share signatures (e.g. a single id path
+    # param), and create_model is the expensive step of tool construction
+    _schema_cache: Dict[tuple, Any] = {}
+
     def __init__(self):
         self.active_servers: Dict[str, Dict[str, Any]] = {}
-        self.port_counter = 9000  # Start from port 9000 for generated servers
+        # Built tools keyed by operation fingerprint: the same operation is
+        # re-registered often (dev reload, identical specs), and rebuilding
+        # means re-running codegen + exec + schema inference every time
+        self._tool_cache: Dict[bytes, Any] = {}
+        # Whole-spec parse results keyed by (spec hash, base_url), so a
+        # repeated registration skips the paths walk entirely
+        self._parse_cache: Dict[tuple, List[Any]] = {}
         
     async def create_mcp_server(self, name: str, openapi_spec: Dict[str, Any], base_url: str) -> int:
-        """Create and start an MCP server from OpenAPI specification"""
+        """Create and start an MCP server from OpenAPI specification
+
+        The schema walking and codegen are pure CPU work, so they run in a
+        worker thread — awaiting them inline would stall every chat request
+        in flight for the duration of a large spec's generation.
+        """
+        return await to_thread_fast(
+            self.create_mcp_server_sync, name, openapi_spec, base_url
+        )
+
+    def create_mcp_server_sync(self, name: str, openapi_spec: Dict[str, Any], base_url: str) -> int:
+        """Synchronous MCP server creation (runs off the event loop)"""
         try:
-            port = self.port_counter
-            self.port_counter += 1
-            
-            # Parse OpenAPI spec and create tools
-            tools = self._parse_openapi_spec(openapi_spec, base_url)
+            port = _alloc_port()
+
+            # Validate the spec with the precompiled validator
+            self._validate_spec(openapi_spec)
+
+            # Parse OpenAPI spec and create tools, reusing the previous
+            # result when the same spec/base_url pair was registered before
+            spec_hash = hashlib.blake2b(
+                _canonical_bytes(openapi_spec),
+                digest_size=16
+            ).digest()
+            parse_key = (spec_hash, base_url)
+            tools = self._parse_cache.get(parse_key)
+            if tools is None:
+                tools = self._parse_openapi_spec(openapi_spec, base_url)
+                self._parse_cache[parse_key] = tools
             
             # For now, let's skip the actual server creation and just return the tools
             # We'll integrate them directly into the main MCP client
@@ -39,282 +264,224 @@ class OpenAPIMCPGenerator:
                 "openapi_spec": openapi_spec
             }
             
-            logger.info(f"Created MCP tools for '{name}' (simulated port {port})")
+            logger.info("Created MCP tools for '%s' (simulated port %d)", name, port)
             return port
             
         except Exception as e:
-            logger.error(f"Failed to create MCP server for {name}: {e}")
+            logger.error("Failed to create MCP server for %s: %s", name, e)
             raise
     
+    def _validate_spec(self, spec: Dict[str, Any]):
+        """Validate an OpenAPI spec against the precompiled meta-schema validator"""
+        if not config.mcp.tool_validation_enabled or _META_VALIDATOR is None:
+            return
+
+        errors = list(_META_VALIDATOR.iter_errors(spec))
+        if errors:
+            messages = "; ".join(e.message for e in errors[:5])
+            raise ValueError(f"Invalid OpenAPI specification: {messages}")
+
+    def _resolve_refs(self, spec: Dict[str, Any]) -> Dict[str, Any]:
+        """Inline #/components/schemas $refs in one pass over the spec.
+
+        Each named schema resolves exactly once into a shared dict (cached,
+        and registered before descent so cyclic refs terminate), turning any
+        later per-operation schema walks into plain dict reads. The input
+        spec is not mutated.
+        """
+        schemas = spec.get("components", {}).get("schemas", {})
+        if not schemas:
+            return spec
+
+        prefix = "#/components/schemas/"
+        resolved_schemas: Dict[str, Any] = {}
+
+        def resolve_schema(name: str) -> Any:
+            if name in resolved_schemas:
+                return resolved_schemas[name]
+            # Register the placeholder before recursing so self-referential
+            # schemas resolve to the shared (eventually populated) dict
+            placeholder: Dict[str, Any] = {}
+            resolved_schemas[name] = placeholder
+            result = resolve(schemas.get(name, {}))
+            if isinstance(result, dict):
+                placeholder.update(result)
+                return placeholder
+            resolved_schemas[name] = result
+            return result
+
+        def resolve(node: Any) -> Any:
+            if isinstance(node, dict):
+                ref = node.get("$ref")
+                if isinstance(ref, str) and ref.startswith(prefix):
+                    return resolve_schema(ref[len(prefix):])
+                return {key: resolve(value) for key, value in node.items()}
+            if isinstance(node, list):
+                return [resolve(item) for item in node]
+            return node
+
+        return resolve(spec)
+
     def _parse_openapi_spec(self, spec: Dict[str, Any], base_url: str) -> List[Callable]:
         """Parse OpenAPI specification and create MCP tools"""
         tools = []
-        
+
+        # Keep the raw paths around for tool fingerprinting: resolved
+        # operations can contain reference cycles that no serializer can hash
+        raw_paths = spec.get("paths", {})
+
+        # Inline $refs up front so tool generation never chases component
+        # references per operation
+        spec = self._resolve_refs(spec)
+
         # Get paths from OpenAPI spec
         paths = spec.get("paths", {})
         components = spec.get("components", {})
         schemas = components.get("schemas", {})
-        
+
         for path, path_info in paths.items():
             for method, operation in path_info.items():
                 if method.lower() in ["get", "post", "put", "delete", "patch"]:
                     tool = self._create_tool_from_operation(
-                        path, method.upper(), operation, base_url, schemas
+                        path, method.upper(), operation, base_url, schemas,
+                        raw_operation=raw_paths.get(path, {}).get(method)
                     )
                     if tool:
                         tools.append(tool)
         
-        logger.info(f"Generated {len(tools)} tools from OpenAPI spec")
+        logger.info("Generated %d tools from OpenAPI spec", len(tools))
         return tools
     
     def _create_tool_from_operation(
         self, 
         path: str, 
         method: str, 
-        operation: Dict[str, Any], 
+        operation: Dict[str, Any],
         base_url: str,
-        schemas: Dict[str, Any]
+        schemas: Dict[str, Any],
+        raw_operation: Optional[Dict[str, Any]] = None
     ) -> Optional[Callable]:
-        """Create a tool function from an OpenAPI operation"""
+        """Create a tool function from an OpenAPI operation.
+
+        `operation` is the $ref-resolved form used for generation;
+        `raw_operation` is the untouched spec fragment used for the cache
+        fingerprint, since resolution can introduce cycles that
+        _canonical_bytes cannot serialize.
+        """
         try:
-            operation_id = operation.get("operationId", f"{method.lower()}_{path.replace('/', '_').replace('{', '').replace('}', '')}")
-            
+            # A tool is fully determined by the operation, its location and
+            # the target base URL, so identical registrations hit the cache
+            cache_key = hashlib.blake2b(
+                _canonical_bytes(raw_operation if raw_operation is not None else operation)
+                + base_url.encode() + method.encode() + path.encode(),
+                digest_size=16
+            ).digest()
+            cached = self._tool_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+            operation_id = operation.get("operationId")
+            if operation_id is None:
+                operation_id = f"{method.lower()}_{path.translate(_OPID_TABLE)}"
+
             # Ensure operation_id is within OpenAI's 64 character limit for function names
-            if len(operation_id) > 64:
-                # Try to create a shorter name while keeping it meaningful
-                # Keep the method and main resource, truncate the rest
-                parts = operation_id.split('_')
-                if len(parts) > 3:
-                    # Keep first part (method) and last meaningful parts
-                    short_name = f"{parts[0]}_{parts[1]}"
-                    if len(short_name) < 50:  # Leave room for more parts
-                        for part in parts[2:]:
-                            if len(short_name + '_' + part) <= 60:  # Leave some buffer
-                                short_name += '_' + part
-                            else:
-                                break
-                    operation_id = short_name
-                
-                # Final fallback: truncate to 64 chars
-                if len(operation_id) > 64:
-                    operation_id = operation_id[:64]
-                    
+            operation_id = _shorten_operation_id(operation_id)
+
             summary = operation.get("summary", f"{method} {path}")
             description = operation.get("description", summary)
             
             # Parse parameters
             parameters = operation.get("parameters", [])
             request_body = operation.get("requestBody", {})
-            
-            # Create function signature and body
-            func_code = self._generate_function_code(
-                operation_id, description, path, method, base_url, 
-                parameters, request_body, schemas
+
+            # Partition path/query parameters in one pass over the list
+            path_params: List[Dict] = []
+            query_params: List[Dict] = []
+            for param in parameters:
+                location = param.get("in")
+                if location == "path":
+                    path_params.append(param)
+                elif location == "query":
+                    query_params.append(param)
+            has_body = bool(request_body.get("content", {}).get("application/json", {}).get("schema"))
+
+            # Resolve everything that doesn't depend on call arguments now:
+            # the URL template keeps the spec's {name} placeholders for a
+            # single format_map pass at call time
+            url_template = urljoin(base_url, path)
+            path_param_names = tuple(p["name"] for p in path_params)
+            query_param_names = tuple(p["name"] for p in query_params)
+            method_lower = method.lower()
+
+            async def api_call(**kwargs) -> str:
+                return await _invoke(
+                    operation_id, url_template, method_lower,
+                    path_param_names, query_param_names, has_body, kwargs
+                )
+
+            api_call.__name__ = operation_id
+            api_call.__doc__ = description
+
+            # Build the StructuredTool directly with a memoized argument
+            # schema instead of letting the @tool decorator re-run signature
+            # introspection and create_model for every operation
+            args_schema = self._get_args_schema(path_params, query_params, has_body)
+            langchain_tool = StructuredTool(
+                name=operation_id,
+                description=description,
+                coroutine=api_call,
+                args_schema=args_schema,
+                # Expose the HTTP method so callers can tell idempotent
+                # lookups from mutations (the chat fast path keys off this)
+                metadata={"http_method": method_lower}
             )
-            
-            # Execute the function code to create the actual function
-            namespace = {
-                'aiohttp': aiohttp,
-                'json': json,
-                'urljoin': urljoin,
-                'logger': logger
-            }
-            exec(func_code, namespace)
-            
-            # Get the function and create a LangChain tool
-            func = namespace[operation_id]
-            func.__name__ = operation_id
-            func.__doc__ = description
-            
-            # Create a LangChain tool using the @tool decorator
-            langchain_tool = tool(func)
-            
+
+            self._tool_cache[cache_key] = langchain_tool
             return langchain_tool
-            
+
         except Exception as e:
-            logger.error(f"Failed to create tool for {method} {path}: {e}")
+            logger.error("Failed to create tool for %s %s: %s", method, path, e)
             return None
-    
-    def _generate_function_code(
+
+    def _get_args_schema(
         self,
-        func_name: str,
-        description: str,
-        path: str,
-        method: str,
-        base_url: str,
-        parameters: List[Dict],
-        request_body: Dict,
-        schemas: Dict
-    ) -> str:
-        """Generate Python function code for the API operation"""
-        
-        # Build parameter list
-        param_list = []
-        param_assignments = []
-        
-        # Path parameters
-        path_params = [p for p in parameters if p.get("in") == "path"]
-        query_params = [p for p in parameters if p.get("in") == "query"]
-        
+        path_params: List[Dict],
+        query_params: List[Dict],
+        has_body: bool
+    ):
+        """Return the pydantic argument schema for an operation's parameters"""
+        fields: Dict[str, tuple] = {}
         for param in path_params + query_params:
-            param_name = param["name"]
-            param_type = self._get_python_type(param.get("schema", {}))
-            required = param.get("required", False)
-            
-            if required:
-                param_list.append(f"{param_name}: {param_type}")
-            else:
-                param_list.append(f"{param_name}: {param_type} = None")
-        
-        # Request body parameters
-        if request_body:
-            content = request_body.get("content", {})
-            if "application/json" in content:
-                schema = content["application/json"].get("schema", {})
-                if schema:
-                    param_list.append("request_data: dict = None")
-        
-        # Build the function
-        func_code = f'''
-async def {func_name}({", ".join(param_list)}) -> str:
-    """{description}"""
-    import aiohttp
-    import json
-    from urllib.parse import urljoin
-    
-    # Build URL
-    url = urljoin("{base_url}", "{path}")
-    
-    # Replace path parameters
-'''
-        
-        # Add path parameter replacements
-        for param in path_params:
-            param_name = param["name"]
-            func_code += f'    url = url.replace("{{{param_name}}}", str({param_name}))\n'
-        
-        # Add query parameters
-        if query_params:
-            func_code += '''    
-    # Build query parameters
-    params = {}
-'''
-            for param in query_params:
-                param_name = param["name"]
-                func_code += f'''    if {param_name} is not None:
-        params["{param_name}"] = {param_name}
-'''
-        
-        # Add HTTP request with comprehensive logging
-        func_code += f'''
-    import logging
-    logger = logging.getLogger(__name__)
-    
-    try:
-        # 🔍 DEBUG: Log API request details
-        logger.info("🌐 API REQUEST STARTED")
-        logger.info("="*60)
-        logger.info("🎯 Tool: {func_name}")
-        logger.info("🔗 Method: {method}")
-        logger.info(f"📍 URL: {{url}}")
-        
-        # Log parameters
-        if 'params' in locals() and params:
-            logger.info(f"🔍 Query Params: {{params}}")
-        else:
-            logger.info("🔍 Query Params: None")
-'''
-        
-        if method in ["POST", "PUT", "PATCH"] and request_body:
-            func_code += f'''        
-        # Log request body for POST/PUT/PATCH
-        if request_data:
-            logger.info(f"📦 Request Body: {{request_data}}")
-        else:
-            logger.info("📦 Request Body: None")
-        
-        async with aiohttp.ClientSession() as session:
-            logger.info(f"🚀 Executing {method} request to {{url}}")
-            
-            async with session.{method.lower()}(
-                url, 
-                json=request_data,
-                params=params if 'params' in locals() else None
-            ) as response:
-'''
-        else:
-            func_code += f'''        
-        async with aiohttp.ClientSession() as session:
-            logger.info(f"🚀 Executing {method} request to {{url}}")
-            
-            async with session.{method.lower()}(
-                url,
-                params=params if 'params' in locals() else None
-            ) as response:
-'''
-        
-        func_code += '''                
-                # 🔍 DEBUG: Log response details
-                logger.info("📨 API RESPONSE RECEIVED")
-                logger.info(f"📊 Status Code: {response.status}")
-                logger.info(f"📋 Headers: {dict(response.headers)}")
-                
-                result_text = await response.text()
-                
-                if response.status == 200:
-                    logger.info(f"✅ Success Response Length: {len(result_text)} characters")
-                    
-                    # Log response preview (first 500 chars)
-                    preview = result_text[:500] + "..." if len(result_text) > 500 else result_text
-                    logger.info(f"📄 Response Preview: {preview}")
-                    
-                    logger.info("="*60)
-                    logger.info("✅ API REQUEST COMPLETED SUCCESSFULLY")
-                    logger.info("="*60)
-                    
-                    return result_text
-                else:
-                    logger.error(f"❌ Error Response: {result_text}")
-                    logger.error("="*60)
-                    logger.error("❌ API REQUEST FAILED")
-                    logger.error("="*60)
-                    
-                    return f"Error: HTTP {response.status} - {result_text}"
-                    
-    except Exception as e:
-        logger.error("💥 API REQUEST EXCEPTION")
-        logger.error("="*60)
-        logger.error(f"🔥 Exception Type: {type(e).__name__}")
-        logger.error(f"📝 Exception Message: {str(e)}")
-        logger.error(f"🔍 Full Exception: {repr(e)}")
-        import traceback
-        logger.error(f"📚 Traceback:\\n{traceback.format_exc()}")
-        logger.error("="*60)
-        
-        return f"Request failed: {str(e)}"
-'''
-        
-        return func_code
-    
-    def _get_python_type(self, schema: Dict[str, Any]) -> str:
-        """Convert OpenAPI schema type to Python type annotation"""
-        schema_type = schema.get("type", "string")
-        
-        type_mapping = {
-            "string": "str",
-            "integer": "int", 
-            "number": "float",
-            "boolean": "bool",
-            "array": "list",
-            "object": "dict"
-        }
-        
-        return type_mapping.get(schema_type, "str")
+            annotation = self._get_python_type(param.get("schema", {}))
+            default = ... if param.get("required", False) else None
+            fields[param["name"]] = (annotation, default)
+
+        if has_body:
+            fields["request_data"] = (dict, None)
+
+        sig_key = tuple(
+            (name, annotation, default is ...)
+            for name, (annotation, default) in fields.items()
+        )
+        schema = self._schema_cache.get(sig_key)
+        if schema is None:
+            schema = create_model("ToolArgs", **fields)
+            self._schema_cache[sig_key] = schema
+        return schema
+
+    def _get_python_type(self, schema: Dict[str, Any]) -> type:
+        """Convert OpenAPI schema type to a Python type annotation"""
+        return _TYPE_MAPPING.get(schema.get("type", "string"), str)
     
     async def shutdown(self):
         """Shutdown all active servers"""
+        global _shared_session
+        if _shared_session is not None and not _shared_session.closed:
+            await _shared_session.close()
+            _shared_session = None
+
         for name, server_info in self.active_servers.items():
-            logger.info(f"Shutting down server: {name}")
+            logger.info("Shutting down server: %s", name)
             # Note: FastMCP servers running in threads are harder to gracefully shutdown
             # In a production environment, you'd want better lifecycle management
         
@@ -10,23 +10,46 @@ import aiohttp
 import time
 from pathlib import Path
 
-async def wait_for_gateway(url: str, max_attempts: int = 30):
+# Prefer orjson for the multi-MB spec round-trips; fall back to stdlib json
+try:
+    import orjson
+    _loads = orjson.loads
+    def _dumps(obj):
+        return orjson.dumps(obj).decode()
+except ImportError:
+    _loads = json.loads
+    _dumps = json.dumps
+
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+async def wait_for_gateway(session: aiohttp.ClientSession, url: str, timeout: float = 30.0):
     """Wait for gateway to be ready"""
     print("⏳ Waiting for gateway to be ready...")
-    
-    for attempt in range(max_attempts):
+
+    # Probes reuse the caller's session, and back off exponentially from
+    # 50ms: the gateway is usually up well under a second, so fixed 1s
+    # polls mostly added startup latency
+    delay = 0.05
+    elapsed = 0.0
+    while elapsed < timeout:
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(f"{url}/health") as response:
-                    if response.status == 200:
-                        print("✅ Gateway is ready!")
-                        return True
-        except:
+            # Bound each probe so hanging connects can't stretch one
+            # attempt across the whole budget
+            async with session.get(
+                f"{url}/health", timeout=aiohttp.ClientTimeout(total=1.0)
+            ) as response:
+                if response.status == 200:
+                    print("✅ Gateway is ready!")
+                    return True
+        except (aiohttp.ClientConnectorError, aiohttp.ClientError, asyncio.TimeoutError):
+            # Gateway not up yet; Ctrl+C and SystemExit still propagate
             pass
-        
-        await asyncio.sleep(1)
-    
-    print("❌ Gateway not ready after 30 seconds")
+
+        await asyncio.sleep(delay)
+        elapsed += delay
+        delay = min(delay * 1.5, 1.0)
+
+    print(f"❌ Gateway not ready after {timeout:.0f} seconds")
     return False
 
 async def run_complete_demo():
@@ -36,22 +59,21 @@ async def run_complete_demo():
     print("🎯 MCP Gateway Complete Demo")
     print("=" * 40)
     
-    # Wait for gateway to be ready
-    if not await wait_for_gateway(gateway_url):
-        print("Please start the gateway first: python start_gateway.py")
-        return
-    
     # Load example OpenAPI spec
     spec_file = Path("example_openapi_spec.json")
     if not spec_file.exists():
         print("❌ example_openapi_spec.json not found")
         return
-    
-    with open(spec_file, "r") as f:
-        openapi_spec = json.load(f)
-    
+
+    openapi_spec = _loads(spec_file.read_bytes())
+
+    # One session covers the readiness probes and every demo request
     async with aiohttp.ClientSession() as session:
-        
+        # Wait for gateway to be ready
+        if not await wait_for_gateway(session, gateway_url):
+            print("Please start the gateway first: python start_gateway.py")
+            return
+
         # Step 1: Register the service
         print("\n📝 Step 1: Registering User Service")
         print("-" * 30)
@@ -62,7 +84,10 @@ async def run_complete_demo():
             "base_url": "https://jsonplaceholder.typicode.com"
         }
         
-        async with session.post(f"{gateway_url}/register-service", json=registration_data) as response:
+        async with session.post(
+            f"{gateway_url}/register-service",
+            data=_dumps(registration_data), headers=_JSON_HEADERS
+        ) as response:
             if response.status == 200:
                 result = await response.json()
                 print(f"✅ Service registered: {result['message']}")
@@ -109,31 +134,39 @@ async def run_complete_demo():
             }
         ]
         
-        for i, demo in enumerate(demo_conversations, 1):
-            print(f"\n🔍 Demo {i}: {demo['description']}")
-            print(f"❓ User: {demo['query']}")
-            
+        # Run the demos concurrently (bounded to 4 in flight) so total wall
+        # time is the slowest conversation, not the sum of them all
+        semaphore = asyncio.Semaphore(4)
+
+        async def run_demo(i: int, demo: dict):
             chat_data = {
                 "message": demo['query'],
                 "session_id": f"demo_session_{i}"
             }
-            
-            start_time = time.time()
-            async with session.post(f"{gateway_url}/chat", json=chat_data) as response:
-                response_time = time.time() - start_time
-                
-                if response.status == 200:
-                    result = await response.json()
-                    print(f"🤖 Assistant: {result['response']}")
-                    if result.get('tools_used'):
-                        print(f"🔧 Tools used: {', '.join(result['tools_used'])}")
-                    print(f"⏱️  Response time: {response_time:.2f}s")
-                else:
-                    error = await response.text()
-                    print(f"❌ Chat failed: {error}")
-            
-            # Small delay between demos
-            await asyncio.sleep(2)
+
+            async with semaphore:
+                start_time = time.time()
+                async with session.post(
+                    f"{gateway_url}/chat",
+                    data=_dumps(chat_data), headers=_JSON_HEADERS
+                ) as response:
+                    response_time = time.time() - start_time
+
+                    print(f"\n🔍 Demo {i}: {demo['description']}")
+                    print(f"❓ User: {demo['query']}")
+                    if response.status == 200:
+                        result = await response.json()
+                        print(f"🤖 Assistant: {result['response']}")
+                        if result.get('tools_used'):
+                            print(f"🔧 Tools used: {', '.join(result['tools_used'])}")
+                        print(f"⏱️  Response time: {response_time:.2f}s")
+                    else:
+                        error = await response.text()
+                        print(f"❌ Chat failed: {error}")
+
+        await asyncio.gather(
+            *(run_demo(i, demo) for i, demo in enumerate(demo_conversations, 1))
+        )
         
         # Step 4: Show final status
         print(f"\n📊 Step 4: Final Status")
@@ -13,18 +13,22 @@ from pathlib import Path
 def check_requirements():
     """Check if all requirements are installed"""
     print("🔍 Checking requirements...")
-    
+
     required_packages = [
-        "fastapi", "uvicorn", "aiohttp", "pydantic", 
+        "fastapi", "uvicorn", "aiohttp", "pydantic",
         "mcp", "langchain-mcp-adapters", "langgraph"
     ]
-    
-    missing_packages = []
-    for package in required_packages:
-        try:
-            __import__(package.replace("-", "_"))
-        except ImportError:
-            missing_packages.append(package)
+
+    # Consult installed-package metadata instead of importing each package:
+    # __import__ executes every module's top-level code, which for the
+    # langchain/fastapi stack adds hundreds of ms of pointless startup work
+    from importlib.metadata import distributions
+    installed = {
+        dist.metadata["Name"].lower().replace("_", "-")
+        for dist in distributions()
+        if dist.metadata["Name"]
+    }
+    missing_packages = [p for p in required_packages if p.lower() not in installed]
     
     if missing_packages:
         print(f"❌ Missing packages: {', '.join(missing_packages)}")
@@ -76,12 +80,15 @@ def start_gateway():
     print("\n" + "="*50)
     
     try:
-        # Import and run the gateway
+        # Import and run the gateway with the same fast loop/parser stack
+        # as the gateway_server entrypoint
         import uvicorn
         uvicorn.run(
             "gateway_server:app",
             host="0.0.0.0",
             port=8090,
+            loop="uvloop",
+            http="httptools",
             reload=True,
             log_level="info"
         )
@@ -0,0 +1,185 @@
+# Low-level stdio transport for MCP subprocesses
+import asyncio
+import json
+import logging
+import subprocess
+from contextlib import asynccontextmanager
+from typing import Any, Dict, List, Optional
+
+from aio_utils import to_thread_fast
+
+logger = logging.getLogger(__name__)
+
+# Frame delimiter shared by every write, allocated once
+_DELIMITER = b'\n'
+
+class StdioTransport:
+    """Zero-thread stdio transport for newline-delimited JSON-RPC subprocesses.
+
+    The default MCP stdio client reads subprocess stdout by offloading
+    blocking readline calls to a thread pool, paying a thread wakeup per
+    message. This transport instead wires the pipes straight into the
+    event loop with loop.connect_read_pipe / connect_write_pipe, so reads
+    and writes happen on the loop with no thread hops.
+
+    Intended for callers that speak raw JSON-RPC to an MCP server process;
+    the demo clients that need a full mcp.ClientSession keep using the
+    library's stdio_client.
+    """
+
+    # Sentinel used to drain dispatch workers on shutdown
+    _STOP = object()
+
+    def __init__(self, command: str, args: Optional[List[str]] = None, read_limit: int = 65536):
+        self.command = command
+        self.args = args or []
+        self.read_limit = read_limit
+        self._process: Optional[subprocess.Popen] = None
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._pump_task: Optional[asyncio.Task] = None
+        self._workers: List[asyncio.Task] = []
+        # Persistent receive buffer reused across messages
+        self._buffer = bytearray()
+
+    async def start(self):
+        """Launch the subprocess and connect its pipes to the event loop"""
+        loop = asyncio.get_running_loop()
+
+        self._process = subprocess.Popen(
+            [self.command] + self.args,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            bufsize=0
+        )
+
+        # Read path: a StreamReader fed directly from the pipe, no threads
+        self._reader = asyncio.StreamReader(limit=self.read_limit)
+        await loop.connect_read_pipe(
+            lambda: asyncio.StreamReaderProtocol(self._reader),
+            self._process.stdout
+        )
+
+        # Write path: a StreamWriter over the stdin pipe transport
+        write_transport, write_protocol = await loop.connect_write_pipe(
+            lambda: asyncio.streams.FlowControlMixin(),
+            self._process.stdin
+        )
+        self._writer = asyncio.StreamWriter(write_transport, write_protocol, None, loop)
+
+        logger.info(f"Started stdio transport for: {self.command}")
+
+    async def read_message(self) -> Dict[str, Any]:
+        """Read one newline-delimited JSON-RPC message.
+
+        Frames are accumulated in a single persistent bytearray and scanned
+        in place for the delimiter, rather than layering readuntil's own
+        buffering (and its per-message slice churn) on top of the pipe's.
+        Only the completed message is copied out.
+        """
+        buffer = self._buffer
+        start = 0
+        while True:
+            end = buffer.find(b'\n', start)
+            if end != -1:
+                message = json.loads(bytes(memoryview(buffer)[:end]))
+                del buffer[:end + 1]
+                return message
+
+            # No complete frame yet: remember where scanning left off and
+            # pull the next chunk straight into the buffer
+            start = len(buffer)
+            chunk = await self._reader.read(self.read_limit)
+            if not chunk:
+                raise asyncio.IncompleteReadError(bytes(buffer), None)
+            buffer.extend(chunk)
+
+    async def send_message(self, message: Dict[str, Any]):
+        """Send one newline-delimited JSON-RPC message.
+
+        writelines hands both buffers to the transport (writev/sendmsg
+        under the hood) instead of concatenating body and delimiter into a
+        fresh bytes object first — one less allocation and memcpy per frame.
+        """
+        self._writer.writelines([json.dumps(message).encode(), _DELIMITER])
+        await self._writer.drain()
+
+    def start_dispatch(self, handler, num_workers: int = 4, queue_size: int = 1024):
+        """Dispatch inbound messages through a fixed-size worker pool.
+
+        Spawning a task per inbound frame churns the scheduler and GC under
+        high-frequency tool traffic; instead a single pump task feeds a
+        bounded queue drained by num_workers long-lived workers, applying
+        backpressure to the subprocess when the queue fills.
+        """
+        self._queue = asyncio.Queue(maxsize=queue_size)
+        self._pump_task = asyncio.create_task(self._pump())
+        self._workers = [
+            asyncio.create_task(self._worker(handler)) for _ in range(num_workers)
+        ]
+
+    async def _pump(self):
+        """Read messages off the pipe and enqueue them for the workers"""
+        try:
+            while True:
+                message = await self.read_message()
+                await self._queue.put(message)
+        except (asyncio.IncompleteReadError, asyncio.CancelledError):
+            pass
+        finally:
+            # Deliver one sentinel per worker; on shutdown any backlog is
+            # dropped to make room (put_nowait so a cancelled pump can't hang)
+            for _ in self._workers:
+                while True:
+                    try:
+                        self._queue.put_nowait(self._STOP)
+                        break
+                    except asyncio.QueueFull:
+                        self._queue.get_nowait()
+
+    async def _worker(self, handler):
+        """Drain the queue until the shutdown sentinel arrives"""
+        while True:
+            message = await self._queue.get()
+            if message is self._STOP:
+                break
+            try:
+                await handler(message)
+            except Exception as e:
+                logger.error(f"Message handler failed: {e}")
+
+    async def close(self):
+        """Close the pipes and terminate the subprocess"""
+        if self._pump_task:
+            self._pump_task.cancel()
+            try:
+                await self._pump_task
+            except asyncio.CancelledError:
+                pass
+        if self._workers:
+            await asyncio.gather(*self._workers)
+            self._workers = []
+        if self._writer:
+            self._writer.close()
+        if self._process:
+            self._process.terminate()
+            # Reap off-loop: Popen.wait blocks, and a stuck child would
+            # otherwise stall the whole event loop for the timeout
+            try:
+                await to_thread_fast(self._process.wait, timeout=5)
+            except subprocess.TimeoutExpired:
+                logger.warning(f"Subprocess did not exit after terminate, killing: {self.command}")
+                self._process.kill()
+                await to_thread_fast(self._process.wait)
+        logger.info(f"Closed stdio transport for: {self.command}")
+
+@asynccontextmanager
+async def stdio_transport(command: str, args: Optional[List[str]] = None):
+    """Context manager yielding a started StdioTransport"""
+    transport = StdioTransport(command, args)
+    await transport.start()
+    try:
+        yield transport
+    finally:
+        await transport.close()
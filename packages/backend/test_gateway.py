@@ -2,40 +2,63 @@
 import asyncio
 import json
 import aiohttp
+from pathlib import Path
 from typing import Dict, Any
 
+# Prefer orjson for spec and payload round-trips; fall back to stdlib json
+try:
+    import orjson
+    _loads = orjson.loads
+    def _dumps(obj):
+        return orjson.dumps(obj).decode()
+except ImportError:
+    _loads = json.loads
+    _dumps = json.dumps
+
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
 class GatewayTester:
     def __init__(self, gateway_url: str = "http://localhost:8090"):
         self.gateway_url = gateway_url
-        
+        self._session: aiohttp.ClientSession = None
+
+    # One session for the whole test run: every helper shares the same
+    # connector instead of rebuilding connections per request
+    async def __aenter__(self):
+        self._session = aiohttp.ClientSession()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self._session.close()
+        self._session = None
+
     async def test_complete_flow(self):
         """Test the complete gateway flow"""
         print("🚀 Starting MCP Gateway Test")
         
         # Load example OpenAPI spec
-        with open("example_openapi_spec.json", "r") as f:
-            openapi_spec = json.load(f)
+        openapi_spec = _loads(Path("example_openapi_spec.json").read_bytes())
         
-        async with aiohttp.ClientSession() as session:
+        async with self:
             # 1. Check gateway health
-            await self._test_health(session)
+            await self._test_health()
             
             # 2. Register OpenAPI service
-            await self._test_register_service(session, openapi_spec)
+            await self._test_register_service(openapi_spec)
             
             # 3. List services
-            await self._test_list_services(session)
+            await self._test_list_services()
             
             # 4. Test chat functionality
-            await self._test_chat_functionality(session)
+            await self._test_chat_functionality()
             
         print("✅ All tests completed!")
     
-    async def _test_health(self, session: aiohttp.ClientSession):
+    async def _test_health(self):
         """Test health endpoint"""
         print("\n📊 Testing health endpoint...")
         try:
-            async with session.get(f"{self.gateway_url}/health") as response:
+            async with self._session.get(f"{self.gateway_url}/health") as response:
                 if response.status == 200:
                     data = await response.json()
                     print(f"✅ Health check passed: {data}")
@@ -44,7 +67,7 @@ class GatewayTester:
         except Exception as e:
             print(f"❌ Health check error: {e}")
     
-    async def _test_register_service(self, session: aiohttp.ClientSession, openapi_spec: Dict[str, Any]):
+    async def _test_register_service(self, openapi_spec: Dict[str, Any]):
         """Test service registration"""
         print("\n📝 Registering OpenAPI service...")
         
@@ -55,9 +78,9 @@ class GatewayTester:
         }
         
         try:
-            async with session.post(
+            async with self._session.post(
                 f"{self.gateway_url}/register-service",
-                json=registration_data
+                data=_dumps(registration_data), headers=_JSON_HEADERS
             ) as response:
                 if response.status == 200:
                     data = await response.json()
@@ -68,11 +91,11 @@ class GatewayTester:
         except Exception as e:
             print(f"❌ Service registration error: {e}")
     
-    async def _test_list_services(self, session: aiohttp.ClientSession):
+    async def _test_list_services(self):
         """Test listing services"""
         print("\n📋 Listing services...")
         try:
-            async with session.get(f"{self.gateway_url}/services") as response:
+            async with self._session.get(f"{self.gateway_url}/services") as response:
                 if response.status == 200:
                     data = await response.json()
                     print(f"✅ Services listed: {data}")
@@ -81,7 +104,7 @@ class GatewayTester:
         except Exception as e:
             print(f"❌ Service listing error: {e}")
     
-    async def _test_chat_functionality(self, session: aiohttp.ClientSession):
+    async def _test_chat_functionality(self):
         """Test chat functionality with various queries"""
         print("\n💬 Testing chat functionality...")
         
@@ -92,12 +115,19 @@ class GatewayTester:
             "What users are available in the system?",
             "Get the first user's information"
         ]
-        
-        for query in test_queries:
-            await self._send_chat_message(session, query)
-            await asyncio.sleep(2)  # Small delay between requests
+
+        # Fire the queries concurrently — total wall time becomes the
+        # slowest response rather than the sum — with a semaphore keeping
+        # at most 4 in flight against the gateway
+        semaphore = asyncio.Semaphore(4)
+
+        async def bounded_send(query: str):
+            async with semaphore:
+                await self._send_chat_message(query)
+
+        await asyncio.gather(*(bounded_send(query) for query in test_queries))
     
-    async def _send_chat_message(self, session: aiohttp.ClientSession, message: str):
+    async def _send_chat_message(self, message: str):
         """Send a chat message and display response"""
         print(f"\n🤖 Query: {message}")
         
@@ -107,9 +137,9 @@ class GatewayTester:
         }
         
         try:
-            async with session.post(
+            async with self._session.post(
                 f"{self.gateway_url}/chat",
-                json=chat_data
+                data=_dumps(chat_data), headers=_JSON_HEADERS
             ) as response:
                 if response.status == 200:
                     data = await response.json()